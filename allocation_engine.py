@@ -0,0 +1,43 @@
+# Importing libraries
+
+import pandas as pd
+
+# ALLOCATION ENGINE
+# Computes the country, industry and country x industry breakdowns of the initial and current weights
+def compute_allocations(metadata, initial_assets_weights, current_assets_weights):
+
+    # One row per asset with categorical country/industry and both weight vectors side by side
+    assets = pd.DataFrame({
+        'Country': pd.Categorical(metadata['Country']),
+        'Industry': pd.Categorical(metadata['Industry']),
+        'initial': metadata.index.map(initial_assets_weights),
+        'current': metadata.index.map(current_assets_weights)
+    })
+
+    # Single grouped pass over both weight vectors; the coarser breakdowns are sums of this small result
+    grouped = assets.groupby(['Country', 'Industry'], observed=True)[['initial', 'current']].sum().reset_index()
+
+    allocations = {}
+    for kind in ('initial', 'current'):
+        country_industry = grouped[['Country', 'Industry', kind]].rename(columns={kind: 'Weight'})
+        country = country_industry.groupby('Country', observed=True)['Weight'].sum().reset_index().sort_values(by='Weight')
+        industry = country_industry.groupby('Industry', observed=True)['Weight'].sum().reset_index().sort_values(by='Weight')
+
+        # Orders countries by total weight and industries by weight within each country
+        country_industry = country_industry.assign(Total=country_industry['Country'].map(country.set_index('Country')['Weight']).astype(float))
+        country_industry = country_industry.sort_values(by=['Total', 'Country', 'Weight']).reset_index(drop=True)
+
+        # Position of each industry within its country's stacked bar and where its segment starts
+        country_industry['Rank'] = country_industry.groupby('Country', observed=True).cumcount()
+        country_industry['Bottom'] = country_industry.groupby('Country', observed=True)['Weight'].cumsum() - country_industry['Weight']
+
+        for frame in (country, industry, country_industry):
+            for column in ('Country', 'Industry'):
+                if column in frame:
+                    frame[column] = frame[column].astype(str)
+
+        allocations[kind] = {'country': country.reset_index(drop=True),
+                             'industry': industry.reset_index(drop=True),
+                             'country_industry': country_industry}
+
+    return allocations
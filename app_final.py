@@ -1,90 +1,101 @@
 
 # Import modules
-import pandas as pd
 import dash
 from dash import dcc, html
 import dash_bootstrap_components as dbc
 from dash.dependencies import Input, Output, State
 from dash.exceptions import PreventUpdate
-import yfinance as yf
 from datetime import datetime
-from fpdf import FPDF
+import uuid
 
 from individual_asset_performance import individual_asset_performance
 from portfolio_performance_vs_benchmark import portfolio_performance_vs_benchmark
-from overview_table import overview_table
-from portfolio_allocation import portfolio_allocation
-from geographical_allocation import geographical_allocation
-from industry_allocation import industry_allocation
-from industry_country_allocation import industry_country_allocation
-from current_value_vs_total_dividends import current_value_vs_total_dividends
-from latest_news import latest_news
-from build_html_layout import build_html_layout
+from build_html_layout import build_performance_layout, build_allocation_layout, build_loading_section
+from report_jobs import submit_report, get_job
+from result_cache import results, result_key, result_ttl
+from config import CHART_BACKEND, TABLE_BACKEND
+from downsampling import needs_downsampling
+from table_rendering import overview_datatable
+from render_artifacts import image_src, register_artifact_route
+from chart_rendering import start_workers, build_plotly_charts, render_missing_charts
+from chart_rendering import INITIAL_CHARTS
+from static_export import start_renderers
 
 from utils import string_to_dict
-from utils import matplotlib_fig_to_img
-from utils import dataframe_table_to_img
-from utils import toggle_images
-from utils import build_pdf
+from utils import TOGGLE_IMAGES_JS
+from utils import zoom_range
+from pdf_report import report_pdf
 
 # Starts the Dash app
 external_stylesheets = [dbc.themes.BOOTSTRAP]
 app = dash.Dash(__name__, external_stylesheets=external_stylesheets)
 
-# Defines the layout of the page
-app.layout = html.Div(
-    [
+# Serves rendered charts and tables at /artifacts/<hash>.png
+register_artifact_route(app.server)
+
+# Defines the layout of the page, with an id for each browser session (a new Submit cancels the session's previous job)
+def serve_layout():
+    return html.Div(
+        [
+            dcc.Store(id='session-id', data=str(uuid.uuid4())),
      
-        # Headers of dashboard
-        html.H1('Stock Portfolio Tracker', style={'text-align': 'center', 'padding-top': 50}),
-        html.H2('An interactive dashboard', style={'text-align': 'center'}),
+            # Headers of dashboard
+            html.H1('Stock Portfolio Tracker', style={'text-align': 'center', 'padding-top': 50}),
+            html.H2('An interactive dashboard', style={'text-align': 'center'}),
 
-        html.Div(
-            html.P("Enter your desired stock tickers (exactly as they appear on Yahoo Finance) and the total amount "
-                   "invested for each security in your portfolio in a dictionary format (Ticker1: Value1, Ticker2: "
-                   "Value2...). Select a benchmark ticker and a date range (dd/mm/yyyy). Select dates when the market was open. "
-                   "Then click Submit to show results. ",
-               style={'text-align': 'center'}
-               ),
-            style={'max-width': '800px', 'margin': '0 auto', 'padding-top': 20}
-        ),
+            html.Div(
+                html.P("Enter your desired stock tickers (exactly as they appear on Yahoo Finance) and the total amount "
+                       "invested for each security in your portfolio in a dictionary format (Ticker1: Value1, Ticker2: "
+                       "Value2...). Select a benchmark ticker and a date range (dd/mm/yyyy). Select dates when the market was open. "
+                       "Then click Submit to show results. ",
+                   style={'text-align': 'center'}
+                   ),
+                style={'max-width': '800px', 'margin': '0 auto', 'padding-top': 20}
+            ),
 
-        # Input divs
-        html.Div(
-            [
-                dbc.Input(id='ticker-input', placeholder='Enter tickers here (dictionary format)...', style={'width': '60%'}),
-                dbc.Input(id='benchmark-input', placeholder='Enter benchmark ticker here...', className='ms-3', style={'width': '20%'}),
-            ],
-            style={'display': 'flex', 'justify-content': 'center'},
-            className='mt-5 mb-3'
-        ),
+            # Input divs
+            html.Div(
+                [
+                    dbc.Input(id='ticker-input', placeholder='Enter tickers here (dictionary format)...', style={'width': '60%'}),
+                    dbc.Input(id='benchmark-input', placeholder='Enter benchmark ticker here...', className='ms-3', style={'width': '20%'}),
+                ],
+                style={'display': 'flex', 'justify-content': 'center'},
+                className='mt-5 mb-3'
+            ),
         
-        html.Div(
-            [
-                dcc.DatePickerRange(id='date-range-input', display_format='DD/MM/YYYY'),
-                html.Button('Submit', id='submit-val', n_clicks=0, className='ms-3 btn btn-primary')
-            ],
-            style={'display': 'flex', 'justify-content': 'center'},
-            className='mb-3'
-        ),
+            html.Div(
+                [
+                    dcc.DatePickerRange(id='date-range-input', display_format='DD/MM/YYYY'),
+                    html.Button('Submit', id='submit-val', n_clicks=0, className='ms-3 btn btn-primary')
+                ],
+                style={'display': 'flex', 'justify-content': 'center'},
+                className='mb-3'
+            ),
         
-        # Divider
-        html.Hr(style={'margin-top': 30}),
+            # Divider
+            html.Hr(style={'margin-top': 30}),
         
-        # Here the output div will be rendered after submit is pressed
-        html.Div(id='output-div')
-    ],
-    style={'padding-bottom': 100}
-)
+            # Here the output div will be rendered after submit is pressed
+            html.Div(id='output-div')
+        ],
+        style={'padding-bottom': 100}
+    )
+
+app.layout = serve_layout
+
+# The web view shows either the table image or an interactive table
+def table_view(report):
+    return overview_datatable(report.table) if TABLE_BACKEND == 'datatable' else image_src(report.context['table_1'])
 
 @app.callback(
     Output('output-div', 'children'),
     Input(component_id = 'submit-val', component_property = 'n_clicks'),
     State(component_id = 'ticker-input', component_property = 'value'),
     State(component_id = 'benchmark-input', component_property = 'value'),
-    [State('date-range-input', 'start_date'), State('date-range-input', 'end_date')]
+    [State('date-range-input', 'start_date'), State('date-range-input', 'end_date')],
+    State(component_id='session-id', component_property='data')
 )
-def update_graphs(n_clicks, assets_and_investments, benchmark, start_date, end_date):
+def update_graphs(n_clicks, assets_and_investments, benchmark, start_date, end_date, session_id):
     
     # Do not update anything before Submit button is pressed
     if n_clicks == 0:
@@ -105,218 +116,245 @@ def update_graphs(n_clicks, assets_and_investments, benchmark, start_date, end_d
     date_from = datetime.strptime(start_date, '%Y-%m-%d').strftime('%Y-%m-%d')
     date_to = datetime.strptime(end_date, '%Y-%m-%d').strftime('%Y-%m-%d')
     
-    # Obtains assets' data with yfinance
-    df = yf.download(tickers=list(assets_and_investments.keys()),
-                     start=date_from, end=date_to)
-
-    # If one or all tickers given start after start date given, do not do anything!
-    if len(df) == 0:
-        return html.Div(html.H4("Data unavailable for one or all selected tickers for the given date range!", style={'margin-top': 20,
-                                'text-align': 'center', 'color': 'red'}))
-
-    if len(assets_and_investments.keys()) == 1:
-        first_valid_index = df['Adj Close'].to_frame().first_valid_index()
-        if first_valid_index and first_valid_index.strftime('%Y-%m-%d') > start_date:
-            return html.Div(html.H4("Data unavailable for one or all selected tickers for the given date range!", style={'margin-top': 20,
-                                    'text-align': 'center', 'color': 'red'}))
+    # Returns the stored report if the same portfolio, benchmark and dates were requested recently
+    key = result_key(assets_and_investments, benchmark, date_from, date_to)
+    cached = results.get(key)
+    if cached is not None:
+        app.ctx, layout, _ = cached
+        return layout
+    
+    # Builds the report in the background and polls it: the performance charts and the overview table are
+    # shown as soon as prices and dividends are in, the allocation charts and the news follow
+    submit_report(session_id, key, assets_and_investments, benchmark, date_from, date_to, on_complete=store_report)
+    return html.Div(id='report-section', children=build_loading_section(key, 'Building report...', 'report'))
 
-    if len(assets_and_investments.keys()) > 1:
-        for ticker in assets_and_investments.keys():
-            first_valid_index = df['Adj Close'][ticker].first_valid_index()
-            if first_valid_index.strftime('%Y-%m-%d') > start_date:
-                return html.Div(html.H4("Data unavailable for one or all selected tickers for the given date range!", style={'margin-top': 20,
-                                        'text-align': 'center', 'color': 'red'}))
+# Red message shown in place of a report or of its allocation part
+def error_message(message):
+    return html.Div(html.H4(message, style={'margin-top': 20, 'text-align': 'center', 'color': 'red'}))
 
-# CALCULATION OF SOME COMMON VALUES ACROSS MULTIPLE FUNCTIONS
-    
-    # Calculates portfolio value
-    initial_total_portfolio_value = sum(assets_and_investments.values())
+# Allocation charts, dividend chart and news of a finished job; the initial charts are filled on their first toggle.
+# Called by the job as soon as the report is complete, so the result cache has it even if no page polls in time
+def store_report(job):
     
-    # Calculates the weights of the portfolio
-    initial_assets_weights = {ticker: value / initial_total_portfolio_value for ticker, value in assets_and_investments.items()} #a dictionary comprehension that iterates over each key-value pair in assets_and_prices.items(). For each pair, it calculates the weight of the asset by dividing its value by the total portfolio value, and then assigns this weight to the asset name (assets) in the resulting dictionary.
+    context = job.context
     
-    # Checks if dataframe has MultiIndex columns
-    if isinstance(df.columns, pd.MultiIndex):
-        df = df['Adj Close'].fillna(df['Close'])  # If 'Adjusted Close' is not available, uses 'Close'
-        
-    # Checks if there are more than just one security in the portfolio
-    if len(initial_assets_weights) > 1:
-        initial_weights = list(initial_assets_weights.values())
-        weighted_returns = df.pct_change().mul(initial_weights, axis = 1)  # Computes weighted returns
-        portfolio_returns = weighted_returns.sum(axis=1)  # Sums weighted returns to build portfolio returns
-    # If there is only one security in the portfolio...
+    # Images of the rendered charts, or interactive figures
+    shown = {name: spec for name, spec in context['chart_specs'].items() if name not in INITIAL_CHARTS}
+    if CHART_BACKEND == 'matplotlib':
+        charts = {name: image_src(context[name]) for name in shown}
     else:
-        df = df['Adj Close'].fillna(df['Close'])  # If 'Adjusted Close' is not available, uses 'Close'
-        portfolio_returns = df.pct_change()  # Computes returns without weights
-    
-    # If working with only one ticker, make sure df has the right format
-    if isinstance(df, pd.Series):
-        df = df.to_frame()
-        df.columns = list(assets_and_investments.keys())
-    
-    # Obtains benchmark data with yfinance
-    benchmark_df = yf.download(benchmark, 
-                               start=date_from, end=date_to) 
-    # If 'Adjusted Close' is not available, uses 'Close'
-    benchmark_df = benchmark_df['Adj Close'].fillna(benchmark_df['Close'])
-    
-    # Computes benchmark returns
-    benchmark_returns = benchmark_df.pct_change()
+        charts = build_plotly_charts(shown)
+    charts.update({name: '' if CHART_BACKEND == 'matplotlib' else {} for name in INITIAL_CHARTS})
     
-    # Obtains dividend data for each asset
-    dividend_data = {}
-    for ticker in assets_and_investments.keys():
-        dividend_data[ticker] = yf.Ticker(ticker).dividends
+    allocation_section = build_allocation_layout(charts['fig_3_1'], charts['fig_3_2'],
+            charts['fig_4_1'], charts['fig_4_2'],
+            charts['fig_5_1'], charts['fig_5_2'],
+            charts['fig_6_1'], charts['fig_6_2'],
+            charts['fig_7'],
+            context['headlines'], context['max_value_ticker'])
     
-    # Concatenates dividend data into a DataFrame
-    dividend_df = pd.concat(dividend_data, axis=1)
-    dividend_df.columns = assets_and_investments.keys()
+    # Stores the complete report for its pages and for identical requests
+    layout = build_performance_layout(context['fig_1'], context['fig_2'], table_view(job.report), job.key, allocation_section)
+    results.put(job.key, (context, layout, allocation_section), ttl=result_ttl(context['end_date']))
     
-    # Calculates the number of times each asset paid dividends during the selected period
-    dividend_count = pd.DataFrame(index=dividend_df.columns)
-    for ticker in dividend_df.columns:
-        # Filters dividends within the specified period and counts the occurrences
-        dividend_count.loc[ticker, 'Dividend Payments'] = dividend_df[ticker][(dividend_df.index >= date_from) & (dividend_df.index <= date_to)].count() 
+    return allocation_section
 
-    # Fills missing values (if no dividends were paid during the period) with 0
-    dividend_count.fillna(0, inplace=True)
-
-    # Calculates the total value generated by all dividend payments for each asset
-    dividend_values = {}
-    for ticker in assets_and_investments.keys():
-        # Finds the number of shares bought for each asset
-        shares_bought = assets_and_investments[ticker] / df.iloc[0][ticker]
-        # Multiplies the number of stocks with the dividends data from yf and sums all the results within the given period
-        dividend_values[ticker] = (dividend_df[ticker][(dividend_df.index >= date_from) & (dividend_df.index <= date_to)] * shares_bought).sum() # It shows the name of the asset and the value
-    
-    # Calculates the total value for each asset for the current date
-    individual_current_value = {}
-    net_profit_loss = {}
-    capital_gains = {}
-    for ticker in assets_and_investments.keys():
-        # Finds the number of shares bought for each asset
-        shares_bought = assets_and_investments[ticker] / df.iloc[0][ticker]
-        # Gets the last Adj Close price available
-        last_price = df.iloc[-1][ticker]
-        # Calculates the current value of each asset and stores it in dictionary
-        individual_current_value[ticker] = shares_bought * last_price
-        # Calculates the net profit of each asset and stores it in dictionary
-        net_profit_loss[ticker] = individual_current_value[ticker] - assets_and_investments[ticker]
-        # Calculates the capital gain of each asset and stores it in dictionary
-        capital_gains[ticker] = (net_profit_loss[ticker] / assets_and_investments[ticker]) * 100
+@app.callback(
+    Output('report-section', 'children'),
+    Input(component_id='report-poll', component_property='n_intervals'),
+    State(component_id='report-request', component_property='data')
+)
+def poll_report(n_intervals, key):
     
-    # Calculates portfolio's most current value, net gains, and capital gains
-    portfolio_current_value = sum(individual_current_value.values())
-    portfolio_net_gains = portfolio_current_value - initial_total_portfolio_value
-    portfolio_capital_gains = (portfolio_net_gains / initial_total_portfolio_value) * 100
+    # A complete report is served from the result cache, even once its job was dropped
+    cached = results.get(key)
+    if cached is not None:
+        app.ctx, layout, _ = cached
+        return layout
     
-    # Calculates current assets weights
-    current_assets_weights = {}
-    for ticker in assets_and_investments.keys():
-        current_assets_weights[ticker] = (individual_current_value[ticker] / portfolio_current_value)
+    job = get_job(key)
+    if job is None:
+        return error_message("The report is no longer available, please submit again!")
+    if not job.performance_ready:
+        raise PreventUpdate
+    if job.report is None:
+        return error_message(job.error)
     
-# CREATION OF FIGURES TO RETURN
+    app.ctx = job.report.context
+    return build_performance_layout(app.ctx['fig_1'], app.ctx['fig_2'], table_view(job.report), key,
+                                    build_loading_section(key, 'Loading allocations and news...', 'allocation'), ready=False)
+
+@app.callback(
+    Output('allocation-section', 'children'),
+    Output('export-button', 'disabled'),
+    Input(component_id='allocation-poll', component_property='n_intervals'),
+    State(component_id='allocation-request', component_property='data')
+)
+def poll_allocations(n_intervals, key):
     
-    # Creates figures and tables
-    fig_1 = individual_asset_performance(initial_assets_weights, df)
-    fig_2 = portfolio_performance_vs_benchmark(portfolio_returns, benchmark_returns)
-    table_1 = overview_table(assets_and_investments, df, dividend_values, dividend_count, initial_total_portfolio_value, 
-                    date_to, date_from, individual_current_value, capital_gains, 
-                    net_profit_loss, portfolio_current_value, portfolio_capital_gains, portfolio_net_gains)
-    fig_3_1, fig_3_2 = portfolio_allocation(initial_assets_weights, assets_and_investments, individual_current_value, portfolio_current_value, current_assets_weights)
-    fig_4_1, fig_4_2 = geographical_allocation(initial_assets_weights, assets_and_investments, current_assets_weights)
-    fig_5_1, fig_5_2 = industry_allocation(initial_assets_weights, assets_and_investments, current_assets_weights)
-    fig_6_1, fig_6_2 = industry_country_allocation(initial_assets_weights, assets_and_investments, current_assets_weights)
-    fig_7 = current_value_vs_total_dividends(assets_and_investments, individual_current_value, dividend_values)
-    headlines, max_value_ticker = latest_news(individual_current_value)
+    cached = results.get(key)
+    if cached is not None:
+        return cached[2], False
     
-    # Stores figures in app's context
-    app.ctx = {'fig_1': fig_1,
-                'fig_2': fig_2,
-                'table_1': dataframe_table_to_img(table_1),
-                'fig_3_1': matplotlib_fig_to_img(fig_3_1),
-                'fig_3_2': matplotlib_fig_to_img(fig_3_2),
-                'fig_4_1': matplotlib_fig_to_img(fig_4_1),
-                'fig_4_2': matplotlib_fig_to_img(fig_4_2),
-                'fig_5_1': matplotlib_fig_to_img(fig_5_1),
-                'fig_5_2': matplotlib_fig_to_img(fig_5_2),
-                'fig_6_1': matplotlib_fig_to_img(fig_6_1),
-                'fig_6_2': matplotlib_fig_to_img(fig_6_2),
-                'fig_7': matplotlib_fig_to_img(fig_7),
-                'headlines': headlines,
-                'start_date': date_from,
-                'end_date': date_to
-                }
+    job = get_job(key)
+    if job is None:
+        return error_message("The report is no longer available, please submit again!"), True
+    if not job.finished:
+        raise PreventUpdate
+    if job.error is not None:
+        return error_message(job.error), True
     
-    return build_html_layout(fig_1, fig_2, dataframe_table_to_img(table_1),
-            matplotlib_fig_to_img(fig_3_1), matplotlib_fig_to_img(fig_3_2),
-            matplotlib_fig_to_img(fig_4_1), matplotlib_fig_to_img(fig_4_2),
-            matplotlib_fig_to_img(fig_5_1), matplotlib_fig_to_img(fig_5_2),
-            matplotlib_fig_to_img(fig_6_1), matplotlib_fig_to_img(fig_6_2),
-            matplotlib_fig_to_img(fig_7),
-            headlines, max_value_ticker)
+    # The report left the result cache since the job stored it
+    return store_report(job), False
                 
 
-@app.callback(
+# Property of an initial chart filled on its first toggle: image source or plotly figure
+INITIAL_PROPERTY = 'figure' if CHART_BACKEND == 'plotly' else 'src'
+
+# Finds the report a page belongs to (a stored report, a report being built, or the latest one)
+def report_context(key):
+    cached = results.get(key)
+    if cached is not None:
+        return cached[0]
+    job = get_job(key)
+    if job is not None and job.report is not None:
+        return job.report.context
+    if getattr(app, 'ctx', {}).get('key') == key:
+        return app.ctx
+    return None
+
+# Draws an initial allocation chart the first time its toggle is pressed; the image is kept with the report
+def initial_chart(name, key):
+    context = report_context(key)
+    if context is None:
+        return dash.no_update
+    if CHART_BACKEND == 'plotly':
+        return build_plotly_charts({name: context['chart_specs'][name]})[name]
+    render_missing_charts(context, [name])
+    return image_src(context[name])
+
+# The Initial/Current toggles run in the browser; only their first press asks the server for the initial chart
+app.clientside_callback(
+    TOGGLE_IMAGES_JS,
     Output(component_id='graph-3-1', component_property='style'),
     Output(component_id='graph-3-2', component_property='style'),
+    Output(component_id='initial-request-3', component_property='data'),
     Input(component_id='toggle-button', component_property='n_clicks'),
     State(component_id='graph-3-1', component_property='style'),
     State(component_id='graph-3-2', component_property='style')
 )
-def toggle_images_1(n_clicks, img1_style, img2_style):
-    return toggle_images(n_clicks, img1_style, img2_style)
-                      
+
 @app.callback(
+    Output(component_id='graph-3-1', component_property=INITIAL_PROPERTY),
+    Input(component_id='initial-request-3', component_property='data'),
+    State(component_id='result-key', component_property='data'),
+    prevent_initial_call=True
+)
+def load_initial_chart_1(request, key):
+    return initial_chart('fig_3_1', key)
+                      
+app.clientside_callback(
+    TOGGLE_IMAGES_JS,
     Output(component_id='graph-4-1', component_property='style'),
     Output(component_id='graph-4-2', component_property='style'),
+    Output(component_id='initial-request-4', component_property='data'),
     Input(component_id='toggle-button-2', component_property='n_clicks'),
     State(component_id='graph-4-1', component_property='style'),
     State(component_id='graph-4-2', component_property='style')
 )
-def toggle_images_2(n_clicks, img1_style, img2_style):
-    return toggle_images(n_clicks, img1_style, img2_style)
-                      
+
 @app.callback(
+    Output(component_id='graph-4-1', component_property=INITIAL_PROPERTY),
+    Input(component_id='initial-request-4', component_property='data'),
+    State(component_id='result-key', component_property='data'),
+    prevent_initial_call=True
+)
+def load_initial_chart_2(request, key):
+    return initial_chart('fig_4_1', key)
+                      
+app.clientside_callback(
+    TOGGLE_IMAGES_JS,
     Output(component_id='graph-5-1', component_property='style'),
     Output(component_id='graph-5-2', component_property='style'),
+    Output(component_id='initial-request-5', component_property='data'),
     Input(component_id='toggle-button-3', component_property='n_clicks'),
     State(component_id='graph-5-1', component_property='style'),
     State(component_id='graph-5-2', component_property='style')
 )
-def toggle_images_3(n_clicks, img1_style, img2_style):
-    return toggle_images(n_clicks, img1_style, img2_style)
-                      
+
 @app.callback(
+    Output(component_id='graph-5-1', component_property=INITIAL_PROPERTY),
+    Input(component_id='initial-request-5', component_property='data'),
+    State(component_id='result-key', component_property='data'),
+    prevent_initial_call=True
+)
+def load_initial_chart_3(request, key):
+    return initial_chart('fig_5_1', key)
+                      
+app.clientside_callback(
+    TOGGLE_IMAGES_JS,
     Output(component_id='graph-6-1', component_property='style'),
     Output(component_id='graph-6-2', component_property='style'),
+    Output(component_id='initial-request-6', component_property='data'),
     Input(component_id='toggle-button-4', component_property='n_clicks'),
     State(component_id='graph-6-1', component_property='style'),
     State(component_id='graph-6-2', component_property='style')
 )
-def toggle_images_4(n_clicks, img1_style, img2_style):
-    return toggle_images(n_clicks, img1_style, img2_style)
+
+@app.callback(
+    Output(component_id='graph-6-1', component_property=INITIAL_PROPERTY),
+    Input(component_id='initial-request-6', component_property='data'),
+    State(component_id='result-key', component_property='data'),
+    prevent_initial_call=True
+)
+def load_initial_chart_4(request, key):
+    return initial_chart('fig_6_1', key)
                   
+# Reloads the down-sampled time series in full detail for the zoomed window
+@app.callback(
+    Output(component_id='graph-1', component_property='figure'),
+    Input(component_id='graph-1', component_property='relayoutData'),
+    State(component_id='result-key', component_property='data'),
+    prevent_initial_call=True
+)
+def zoom_graph_1(relayout_data, key):
+    x_range, context = zoom_range(relayout_data), report_context(key)
+    if x_range is None or context is None or not needs_downsampling(len(context['series_1'])):
+        raise PreventUpdate
+    return individual_asset_performance(context['series_1'], None if x_range == 'all' else x_range)
+
+@app.callback(
+    Output(component_id='graph-2', component_property='figure'),
+    Input(component_id='graph-2', component_property='relayoutData'),
+    State(component_id='result-key', component_property='data'),
+    prevent_initial_call=True
+)
+def zoom_graph_2(relayout_data, key):
+    x_range, context = zoom_range(relayout_data), report_context(key)
+    if x_range is None or context is None or not needs_downsampling(len(context['series_2'][0])):
+        raise PreventUpdate
+    portfolio_cumsum, benchmark_cumsum = context['series_2']
+    return portfolio_performance_vs_benchmark(portfolio_cumsum, benchmark_cumsum, None if x_range == 'all' else x_range)
+
 @app.callback(
     Output(component_id='output-pdf', component_property='data'),
     Input(component_id='export-button', component_property='n_clicks'),
+    State(component_id='result-key', component_property='data'),
     prevent_initial_call=True
 )
-def export_pdf(n_clicks):
+def export_pdf(n_clicks, key):
     
-    if not hasattr(app, 'ctx') or len(app.ctx) == 0:
-        return None
+    # Exports the report shown on this page, not the latest one built by any session
+    context = report_context(key)
     
-    def create_pdf(bytes_io):
-        
-        pdf = FPDF(orientation='L')
-        
-        build_pdf(pdf, app.ctx)
-    
-        pdf_data = pdf.output(dest = 'S').encode('latin-1')
-        bytes_io.write(pdf_data)
+    # Nothing to export until the report is complete (allocation charts and news included)
+    if context is None or 'chart_specs' not in context:
+        return None
     
-    return dcc.send_bytes(create_pdf, 'output.pdf')
+    # Stored PDF bytes when the report was precomputed or exported before, otherwise built now (in memory)
+    return dcc.send_bytes(report_pdf(context), 'output.pdf')
 
 if __name__ == '__main__':
+    start_workers()
+    start_renderers()
     app.run_server(debug=False,dev_tools_ui=False,dev_tools_props_check=False)
@@ -0,0 +1,90 @@
+# Importing libraries
+
+import argparse
+import json
+
+import numpy as np
+import pandas as pd
+
+from dividend_store import dividend_window
+from fetch_stage import fetch_universe
+from overview_table import overview_metrics
+from portfolio_engine import compute_portfolios
+
+# BATCH EVALUATION OF MANY PORTFOLIOS
+# portfolios is a {name: {ticker: investment}} dictionary; all portfolios share the same date range
+def evaluate_portfolios(portfolios, date_from, date_to):
+
+    # Fetches the union of all tickers once
+    universe = list(dict.fromkeys(ticker for holdings in portfolios.values() for ticker in holdings))
+    df, dividend_data = fetch_universe(universe, date_from, date_to)
+    if len(df) == 0:
+        return {name: None for name in portfolios}
+    prices = df[universe].to_numpy(dtype=float)
+
+    # Tickers without data from the start of the period cannot be evaluated
+    available = np.array([df[ticker].first_valid_index() is not None and
+                          df[ticker].first_valid_index().strftime('%Y-%m-%d') <= date_from for ticker in universe])
+
+    # Builds the investments matrix: one row per portfolio, one column per ticker of the universe
+    names = list(portfolios.keys())
+    column = {ticker: position for position, ticker in enumerate(universe)}
+    investments = np.zeros((len(names), len(universe)))
+    for row, name in enumerate(names):
+        for ticker, investment in portfolios[name].items():
+            investments[row, column[ticker]] = investment
+
+    # Dividends per share paid in the period and number of payments, for every ticker in one slice
+    dividend_payments, dividends_per_share = dividend_window(dividend_data, universe, date_from, date_to)
+    dividend_payments, dividends_per_share = dividend_payments.to_numpy(), dividends_per_share.to_numpy()
+
+    # Evaluates all portfolios at once with the same engine as the web report
+    matrix = compute_portfolios(prices, investments)
+    dividend_values = matrix.shares * dividends_per_share
+
+    # Builds the overview table values of each portfolio from its row of the matrices
+    results = {}
+    for row, name in enumerate(names):
+        columns = [column[ticker] for ticker in portfolios[name]]
+        if not available[columns].all():
+            results[name] = None
+            continue
+        tickers = list(portfolios[name].keys())
+        results[name] = overview_metrics(dict(zip(tickers, dividend_values[row, columns])),
+                                         pd.DataFrame({'Dividend Payments': dividend_payments[columns]}, index=tickers),
+                                         dict(zip(tickers, matrix.current_values[row, columns])),
+                                         dict(zip(tickers, matrix.capital_gains[row, columns])),
+                                         dict(zip(tickers, matrix.net_profit_loss[row, columns])),
+                                         matrix.current_total_values[row], matrix.total_capital_gains[row], matrix.net_gains[row])
+
+    return results
+
+# Summarizes the 'Portfolio' row of each result, one row per portfolio
+def summary_table(results):
+    return pd.DataFrame({name: metrics.loc['Portfolio'] if metrics is not None else pd.Series(dtype=float)
+                         for name, metrics in results.items()}).T
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Evaluates many portfolios against one shared price download.')
+    parser.add_argument('portfolios', help='JSON file: {"name": {"Ticker1": Value1, "Ticker2": Value2, ...}, ...}')
+    parser.add_argument('--start', required=True, help='yyyy-mm-dd')
+    parser.add_argument('--end', required=True, help='yyyy-mm-dd')
+    parser.add_argument('--out', help='CSV file for the per-asset overview of every portfolio')
+    args = parser.parse_args()
+
+    with open(args.portfolios) as file:
+        portfolios = json.load(file)
+
+    results = evaluate_portfolios(portfolios, args.start, args.end)
+    print(summary_table(results).to_string())
+
+    # Portfolios holding a ticker without data for the whole period are reported and skipped
+    for name, metrics in results.items():
+        if metrics is None:
+            print(f'{name}: data unavailable for one or all tickers for the given date range!')
+
+    evaluated = {name: metrics for name, metrics in results.items() if metrics is not None}
+    if args.out and evaluated:
+        pd.concat(evaluated, names=['Portfolio', 'Ticker']).to_csv(args.out)
+    elif args.out:
+        print(f'No portfolio could be evaluated, {args.out} was not written.')
@@ -0,0 +1,136 @@
+# Importing libraries
+
+import argparse
+import json
+import os
+import re
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+import chart_rendering
+import static_export
+from fetch_stage import FetchTimeout, fetch_universe
+from pdf_report import build_report_pdf
+from pipeline import ReportError, build_allocation_stage, build_performance_stage
+from result_cache import result_key
+from ticker_metadata import get_ticker_metadata
+
+# BATCH PDF REPORTS
+# portfolios.json looks like {"name": {"holdings": {"Ticker1": Value1, ...}, "benchmark": "SPY",
+# "start": "yyyy-mm-dd", "end": "yyyy-mm-dd"}, ...}; a missing benchmark or date falls back to the command line's,
+# and a plain {"Ticker1": Value1, ...} entry (as read by batch.py) is taken as the holdings
+def read_portfolios(path, benchmark=None, date_from=None, date_to=None):
+
+    with open(path) as file:
+        entries = json.load(file)
+
+    portfolios = {}
+    for name, entry in entries.items():
+        if 'holdings' not in entry:
+            entry = {'holdings': entry}
+        portfolios[name] = {'holdings': {ticker: float(value) for ticker, value in entry['holdings'].items()},
+                            'benchmark': entry.get('benchmark', benchmark),
+                            'start': entry.get('start', date_from),
+                            'end': entry.get('end', date_to)}
+        if not portfolios[name]['benchmark'] or not portfolios[name]['start'] or not portfolios[name]['end']:
+            raise ValueError(f'{name}: a benchmark, a start date and an end date are required!')
+
+    return portfolios
+
+# Downloads the union of the tickers of all portfolios once (per date range), filling the local caches the
+# workers read from; a failure here only means the workers download what is missing themselves
+def prefetch(portfolios):
+
+    ranges = {}
+    for portfolio in portfolios.values():
+        tickers = ranges.setdefault((portfolio['start'], portfolio['end']), [])
+        tickers.extend(list(portfolio['holdings']) + [portfolio['benchmark']])
+
+    for (date_from, date_to), tickers in ranges.items():
+        try:
+            fetch_universe(tickers, date_from, date_to)
+        except FetchTimeout:
+            pass
+
+    get_ticker_metadata([ticker for portfolio in portfolios.values() for ticker in portfolio['holdings']])
+
+# Each worker process is already one of many, so it draws its charts itself and keeps a single kaleido renderer
+def _init_worker():
+    chart_rendering.RENDER_PROCESSES = 1
+    static_export.renderers = static_export.RendererPool(1)
+
+def _file_name(name):
+    return re.sub(r'[^\w.-]+', '_', name).strip('_') + '.pdf'
+
+# BUILDS ONE PORTFOLIO'S REPORT AND WRITES ITS PDF (runs inside a worker process)
+# Returns the time taken by each stage, or the reason the report could not be built
+def build_portfolio_pdf(name, portfolio, out_dir):
+
+    timings = {'portfolio': name, 'file': None, 'performance_s': None, 'allocation_s': None, 'pdf_s': None,
+               'total_s': None, 'bytes': None, 'error': None}
+    started = time.perf_counter()
+
+    try:
+        key = result_key(portfolio['holdings'], portfolio['benchmark'], portfolio['start'], portfolio['end'])
+        report = build_performance_stage(key, portfolio['holdings'], portfolio['benchmark'], portfolio['start'], portfolio['end'])
+        timings['performance_s'] = time.perf_counter() - started
+
+        context = build_allocation_stage(report)
+        timings['allocation_s'] = time.perf_counter() - started - timings['performance_s']
+
+        data = build_report_pdf(context)
+        timings['pdf_s'] = time.perf_counter() - started - timings['performance_s'] - timings['allocation_s']
+
+        path = os.path.join(out_dir, _file_name(name))
+        with open(path, 'wb') as file:
+            file.write(data)
+        timings['file'], timings['bytes'] = path, len(data)
+    except ReportError as error:
+        timings['error'] = str(error)
+    except Exception as error:
+        timings['error'] = f'The report could not be built: {error}'
+
+    timings['total_s'] = time.perf_counter() - started
+    return timings
+
+# WRITES THE PDF OF EVERY PORTFOLIO
+# Returns the timing summary, one row per portfolio in the order given
+def build_portfolio_pdfs(portfolios, out_dir, workers=None):
+
+    os.makedirs(out_dir, exist_ok=True)
+    prefetch(portfolios)
+
+    # 'spawn' starts clean workers, as for the chart rendering pool
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                             initializer=_init_worker) as pool:
+        futures = [pool.submit(build_portfolio_pdf, name, portfolio, out_dir) for name, portfolio in portfolios.items()]
+        rows = {}
+        for future in as_completed(futures):
+            timings = future.result()
+            rows[timings['portfolio']] = timings
+
+    return pd.DataFrame([rows[name] for name in portfolios]).set_index('portfolio')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Writes the PDF report of many portfolios, in parallel.')
+    parser.add_argument('portfolios', help='JSON file: {"name": {"holdings": {"Ticker1": Value1, ...}, "benchmark": "SPY", '
+                                           '"start": "yyyy-mm-dd", "end": "yyyy-mm-dd"}, ...}')
+    parser.add_argument('--out-dir', default='reports', help='directory for the PDFs and the timing summary')
+    parser.add_argument('--benchmark', help='benchmark of the portfolios that do not give one')
+    parser.add_argument('--start', help='yyyy-mm-dd, for the portfolios that do not give one')
+    parser.add_argument('--end', help='yyyy-mm-dd, for the portfolios that do not give one')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='worker processes (default: one per CPU)')
+    args = parser.parse_args()
+
+    portfolios = read_portfolios(args.portfolios, args.benchmark, args.start, args.end)
+
+    started = time.perf_counter()
+    summary = build_portfolio_pdfs(portfolios, args.out_dir, args.workers)
+    elapsed = time.perf_counter() - started
+
+    summary.to_csv(os.path.join(args.out_dir, 'timings.csv'))
+    print(summary.drop(columns=['file']).round(2).to_string())
+    print(f'{summary["error"].isna().sum()} of {len(summary)} reports written to {args.out_dir} in {elapsed:.1f}s')
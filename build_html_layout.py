@@ -16,14 +16,34 @@ def generate_news_component(headlines):
 
     return news_items
 
-def build_html_layout(fig_1, fig_2, table_1, fig_3_1, fig_3_2, fig_4_1, fig_4_2, \
-            fig_5_1, fig_5_2, fig_6_1, fig_6_2, fig_7, headlines, max_value_ticker):
-    
+# Shows a chart as an image (src) or as an interactive figure, keeping the same id and style
+def chart_view(id, chart, style):
+    if isinstance(chart, str):
+        return html.Img(id=id, src=chart, style=style)
+    return dcc.Graph(id=id, figure=chart, style=style)
+
+# Shown while a part of the report is being built in the background; the page polls the job
+# (<name>-poll) until that part is ready, and is replaced by it
+def build_loading_section(key, message, name):
+    return html.Div(
+        [
+            dbc.Spinner(color='primary'),
+            html.P(message, style={'margin-top': 10}),
+            dcc.Interval(id=f'{name}-poll', interval=500),
+            dcc.Store(id=f'{name}-request', data=key)
+        ],
+        style={'text-align': 'center', 'margin-bottom': 30}
+    )
+
+# First part of the report: performance charts and overview table, followed by the allocation section
+# (the charts themselves, or the loading indicator until they are ready)
+def build_performance_layout(fig_1, fig_2, table_1, key, allocation_section, ready=True):
+
         return html.Div(
             [
                 dbc.Row(
                     [
-                        dbc.Col(html.Button('Export Report to PDF', id='export-button', className='btn btn-info')),
+                        dbc.Col(html.Button('Export Report to PDF', id='export-button', className='btn btn-info', disabled=not ready)),
                     ],
                     style={'margin-bottom': 10}
                 ),
@@ -38,12 +58,27 @@ def build_html_layout(fig_1, fig_2, table_1, fig_3_1, fig_3_2, fig_4_1, fig_4_2,
                 ),
                 dbc.Row(
                     [
-                        dbc.Col(html.Img(id='table-1', src = table_1, style={'width': '100%', 'height': '250px'}),
+                        dbc.Col(html.Img(id='table-1', src = table_1, style={'width': '100%', 'height': '250px'})
+                                if isinstance(table_1, str) else table_1,
                                 width=8, style={'border-radius': '10px'}
                         )
                     ],
                     justify='center', style={'margin-bottom': 30}
                 ),
+                html.Div(id='allocation-section', children=allocation_section),
+                dcc.Download(id="output-pdf"),
+                # Identifies the report, so the toggles can draw its initial charts on demand
+                dcc.Store(id='result-key', data=key)
+            ],
+            style={'background-color': '#f2f2f2', 'padding': 20, 'border-radius': '20px', 'margin': '50px'}
+        )
+
+# Second part of the report: allocation charts with their Initial/Current toggles, dividends and news
+def build_allocation_layout(fig_3_1, fig_3_2, fig_4_1, fig_4_2, fig_5_1, fig_5_2, fig_6_1, fig_6_2, fig_7,
+                            headlines, max_value_ticker):
+
+        return html.Div(
+            [
                 dbc.Row(
                     [
                        dbc.Col(html.Button('Initial/Current', id='toggle-button', className='btn btn-warning'), width=1),
@@ -55,14 +90,14 @@ def build_html_layout(fig_1, fig_2, table_1, fig_3_1, fig_3_2, fig_4_1, fig_4_2,
                     [
                         dbc.Col(
                             [
-                                html.Img(id='graph-3-2', src = fig_3_2, style={'display': 'block', 'width': '100%', 'height': 'auto'}),
-                                html.Img(id='graph-3-1', src = fig_3_1, style={'display': 'none', 'width': '100%', 'height': 'auto'})
+                                chart_view('graph-3-2', fig_3_2, {'display': 'block', 'width': '100%', 'height': 'auto'}),
+                                chart_view('graph-3-1', fig_3_1, {'display': 'none', 'width': '100%', 'height': 'auto'})
                             ], width=6, style={'border-radius': '10px'}
                         ),
                        dbc.Col(
                             [
-                                html.Img(id='graph-4-2', src = fig_4_2, style={'display': 'block', 'width': '100%', 'height': 'auto'}),
-                                html.Img(id='graph-4-1', src = fig_4_1, style={'display': 'none', 'width': '100%', 'height': 'auto'})
+                                chart_view('graph-4-2', fig_4_2, {'display': 'block', 'width': '100%', 'height': 'auto'}),
+                                chart_view('graph-4-1', fig_4_1, {'display': 'none', 'width': '100%', 'height': 'auto'})
                             ], width=6, style={'border-radius': '10px'}
                         ),
                     ],
@@ -79,14 +114,14 @@ def build_html_layout(fig_1, fig_2, table_1, fig_3_1, fig_3_2, fig_4_1, fig_4_2,
                     [
                         dbc.Col(
                             [
-                                html.Img(id='graph-5-2', src = fig_5_2, style={'display': 'block', 'width': '100%', 'height': 'auto'}),
-                                html.Img(id='graph-5-1', src = fig_5_1, style={'display': 'none', 'width': '100%', 'height': 'auto'})
+                                chart_view('graph-5-2', fig_5_2, {'display': 'block', 'width': '100%', 'height': 'auto'}),
+                                chart_view('graph-5-1', fig_5_1, {'display': 'none', 'width': '100%', 'height': 'auto'})
                             ], width=6, style={'border-radius': '10px'}
                         ),
                        dbc.Col(
                             [
-                                html.Img(id='graph-6-2', src = fig_6_2, style={'display': 'block', 'width': '100%', 'height': 'auto'}),
-                                html.Img(id='graph-6-1', src = fig_6_1, style={'display': 'none', 'width': '100%', 'height': 'auto'})
+                                chart_view('graph-6-2', fig_6_2, {'display': 'block', 'width': '100%', 'height': 'auto'}),
+                                chart_view('graph-6-1', fig_6_1, {'display': 'none', 'width': '100%', 'height': 'auto'})
                             ], width=6, style={'border-radius': '10px'}
                         ),
                     ],
@@ -94,7 +129,7 @@ def build_html_layout(fig_1, fig_2, table_1, fig_3_1, fig_3_2, fig_4_1, fig_4_2,
                 ),
                 dbc.Row(
                     [
-                        dbc.Col(html.Img(id='graph-7', src = fig_7, style={'width': '100%', 'height': 'auto'}),
+                        dbc.Col(chart_view('graph-7', fig_7, {'width': '100%', 'height': 'auto'}),
                                 width=6, style={'border-radius': '10px'}
                         )
                     ],
@@ -115,7 +150,9 @@ def build_html_layout(fig_1, fig_2, table_1, fig_3_1, fig_3_2, fig_4_1, fig_4_2,
                         )
                     ]
                 ),
-                dcc.Download(id="output-pdf")
-            ],
-            style={'background-color': '#f2f2f2', 'padding': 20, 'border-radius': '20px', 'margin': '50px'}
-        )
\ No newline at end of file
+                dcc.Store(id='initial-request-3'),
+                dcc.Store(id='initial-request-4'),
+                dcc.Store(id='initial-request-5'),
+                dcc.Store(id='initial-request-6')
+            ]
+        )
@@ -0,0 +1,127 @@
+# Importing libraries
+
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from config import RENDER_PROCESSES
+from portfolio_allocation import plot_portfolio_allocation, plotly_portfolio_allocation
+from geographical_allocation import plot_geographical_allocation, plotly_geographical_allocation
+from industry_allocation import plot_industry_allocation, plotly_industry_allocation
+from industry_country_allocation import plot_industry_country_allocation, plotly_industry_country_allocation
+from current_value_vs_total_dividends import current_value_vs_total_dividends, plotly_current_value_vs_total_dividends
+from render_artifacts import figure_to_png, store_artifact
+
+# Chart functions a job can name; each draws one matplotlib figure from plain data
+CHARTS = {
+    'portfolio_allocation': plot_portfolio_allocation,
+    'geographical_allocation': plot_geographical_allocation,
+    'industry_allocation': plot_industry_allocation,
+    'industry_country_allocation': plot_industry_country_allocation,
+    'current_value_vs_total_dividends': current_value_vs_total_dividends,
+}
+
+# Interactive versions of the same charts, taking the same arguments
+PLOTLY_CHARTS = {
+    'portfolio_allocation': plotly_portfolio_allocation,
+    'geographical_allocation': plotly_geographical_allocation,
+    'industry_allocation': plotly_industry_allocation,
+    'industry_country_allocation': plotly_industry_country_allocation,
+    'current_value_vs_total_dividends': plotly_current_value_vs_total_dividends,
+}
+
+# Initial allocation charts, drawn only when their toggle is first pressed
+INITIAL_CHARTS = ['fig_3_1', 'fig_4_1', 'fig_5_1', 'fig_6_1']
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# CHART JOBS OF A REPORT
+# Every job is a plain (chart name, arguments) pair, so it can be sent to another process
+def chart_specs(assets_and_investments, initial_assets_weights, current_assets_weights, allocations,
+                individual_current_value, dividend_values):
+    return {
+        'fig_3_1': ('portfolio_allocation', (initial_assets_weights, 'Initial Portfolio Allocation')),
+        'fig_3_2': ('portfolio_allocation', (current_assets_weights, 'Current Portfolio Allocation')),
+        'fig_4_1': ('geographical_allocation', (allocations['initial']['country'], 'Initial Geographical Allocation')),
+        'fig_4_2': ('geographical_allocation', (allocations['current']['country'], 'Current Geographical Allocation')),
+        'fig_5_1': ('industry_allocation', (allocations['initial']['industry'], 'Initial Industry Allocation')),
+        'fig_5_2': ('industry_allocation', (allocations['current']['industry'], 'Current Industry Allocation')),
+        'fig_6_1': ('industry_country_allocation', (allocations['initial']['country_industry'], allocations['initial']['country'],
+                                                    'Initial Industry Allocation by Country')),
+        'fig_6_2': ('industry_country_allocation', (allocations['current']['country_industry'], allocations['current']['country'],
+                                                    'Current Industry Allocation by Country')),
+        'fig_7': ('current_value_vs_total_dividends', (assets_and_investments, individual_current_value, dividend_values)),
+    }
+
+def _ready():
+    return True
+
+# Draws one chart and returns its PNG bytes (runs inside a worker process)
+def render_job(job):
+    chart, args = job
+    return figure_to_png(CHARTS[chart](*args))
+
+def _get_pool():
+
+    # Starts the worker processes once; 'spawn' avoids forking a process that runs server threads
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=RENDER_PROCESSES, mp_context=multiprocessing.get_context('spawn'))
+        return _pool
+
+# Starts the workers ahead of the first request, which otherwise pays for their start-up
+def start_workers():
+    if RENDER_PROCESSES > 1:
+        pool = _get_pool()
+        for future in [pool.submit(_ready) for _ in range(RENDER_PROCESSES)]:
+            future.result()
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        _pool = None
+
+# STARTS RENDERING CHART JOBS IN PARALLEL
+# Returns {name: future}, so the caller can do other work (e.g. the table) while the workers draw
+def submit_charts(specs):
+
+    if RENDER_PROCESSES > 1:
+        try:
+            pool = _get_pool()
+            return {name: pool.submit(render_job, job) for name, job in specs.items()}
+        except BrokenProcessPool:
+            _reset_pool()
+
+    # Renders here when parallel rendering is off or unavailable
+    futures = {}
+    for name, job in specs.items():
+        futures[name] = Future()
+        futures[name].set_result(render_job(job))
+    return futures
+
+# Waits for the charts started by submit_charts and returns {name: Artifact}
+def collect_charts(specs, futures):
+    try:
+        return {name: store_artifact(future.result()) for name, future in futures.items()}
+    except BrokenProcessPool:
+        # A worker died (e.g. killed for memory); renders this request here and starts a new pool next time
+        _reset_pool()
+        return {name: store_artifact(render_job(job)) for name, job in specs.items()}
+
+def render_charts(specs):
+    return collect_charts(specs, submit_charts(specs))
+
+# BUILDS THE INTERACTIVE FIGURES OF CHART JOBS
+# Returns {name: plotly figure}; nothing is rasterized
+def build_plotly_charts(specs):
+    return {name: PLOTLY_CHARTS[chart](*args) for name, (chart, args) in specs.items()}
+
+# Renders the images of a report's charts that were not rendered yet (e.g. for the PDF when the page shows plotly
+# figures, or an initial chart on its first toggle)
+def render_missing_charts(context, names):
+    missing = {name: context['chart_specs'][name] for name in names if name not in context}
+    if missing:
+        context.update(render_charts(missing))
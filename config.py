@@ -0,0 +1,85 @@
+# Importing libraries
+
+import os
+
+# PLATFORM SETTINGS
+# Every setting can be overridden with an environment variable of the same name
+
+# Source of prices, dividends, metadata and news: 'yahoo' (live) or 'local' (fixture files / synthetic data)
+MARKET_DATA_PROVIDER = os.environ.get('MARKET_DATA_PROVIDER', 'yahoo')
+
+# Directory with the fixture files read by the local provider (tickers without fixtures get synthetic data)
+LOCAL_DATA_DIR = os.environ.get('LOCAL_DATA_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures'))
+
+# Directory where the local on-disk caches are kept, one per provider so live and offline data never mix
+CACHE_DIR = os.environ.get('CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', MARKET_DATA_PROVIDER))
+
+# SQLite file holding the cached daily price history of every ticker requested so far
+PRICE_CACHE_PATH = os.environ.get('PRICE_CACHE_PATH', os.path.join(CACHE_DIR, 'prices.sqlite'))
+
+# SQLite file holding the cached country/industry/sector of every ticker requested so far
+METADATA_CACHE_PATH = os.environ.get('METADATA_CACHE_PATH', os.path.join(CACHE_DIR, 'metadata.sqlite'))
+
+# Seconds before a ticker's cached metadata is fetched again (sector and country rarely change)
+METADATA_TTL = int(os.environ.get('METADATA_TTL', 7 * 24 * 60 * 60))
+
+# SQLite file holding the cached dividend and stock split history of every ticker requested so far
+DIVIDEND_CACHE_PATH = os.environ.get('DIVIDEND_CACHE_PATH', os.path.join(CACHE_DIR, 'dividends.sqlite'))
+
+# Seconds before a ticker's stored dividend history is refreshed with the actions since its last refresh
+DIVIDEND_TTL = int(os.environ.get('DIVIDEND_TTL', 24 * 60 * 60))
+
+# Threads shared by all requests for the network fetches (prices, dividends, metadata, news)
+FETCH_MAX_WORKERS = int(os.environ.get('FETCH_MAX_WORKERS', 16))
+
+# Seconds each source may take before the request gives up on it (FETCH_TIMEOUT_<SOURCE>)
+FETCH_TIMEOUTS = {source: float(os.environ.get('FETCH_TIMEOUT_' + source.upper(), default))
+                  for source, default in {'prices': 60, 'dividends': 30, 'metadata': 30, 'news': 10}.items()}
+
+# Maximum number of simultaneous per-ticker calls to the provider for each source (FETCH_CONCURRENCY_<SOURCE>)
+FETCH_CONCURRENCY = {source: int(os.environ.get('FETCH_CONCURRENCY_' + source.upper(), default))
+                     for source, default in {'dividends': 8, 'metadata': 8}.items()}
+
+# Number of finished reports kept in memory, the least recently used being evicted first
+RESULT_CACHE_SIZE = int(os.environ.get('RESULT_CACHE_SIZE', 32))
+
+# Seconds a stored report stays valid when its date range ends today or later (prices still move)
+RESULT_CACHE_TTL = int(os.environ.get('RESULT_CACHE_TTL', 15 * 60))
+
+# Memory kept for rendered images (PNG bytes), shared by identical images across requests
+ARTIFACT_CACHE_BYTES = int(os.environ.get('ARTIFACT_CACHE_BYTES', 256 * 1024 * 1024))
+
+# Worker processes rendering the matplotlib charts in parallel (0 or 1 renders them on the request thread)
+RENDER_PROCESSES = int(os.environ.get('RENDER_PROCESSES', os.cpu_count() or 1))
+
+# How the overview table is drawn: 'matplotlib' (image, no browser needed), 'datatable' (interactive Dash table
+# on the page, matplotlib image in the PDF) or 'dataframe_image' (browser screenshot of the styled table)
+TABLE_BACKEND = os.environ.get('TABLE_BACKEND', 'matplotlib')
+
+# How the page receives images: 'url' (served by /artifacts/<hash>.png and cached by the browser) or 'inline' (base64)
+IMAGE_DELIVERY = os.environ.get('IMAGE_DELIVERY', 'url')
+
+# Optional directory where rendered images are also written, so any server process can serve them
+ARTIFACT_DIR = os.environ.get('ARTIFACT_DIR', '')
+
+# How the allocation and dividend charts are shown on the page: 'matplotlib' (images) or 'plotly' (interactive
+# figures); the PDF always uses the matplotlib images
+CHART_BACKEND = os.environ.get('CHART_BACKEND', 'matplotlib')
+
+# Points per line above which the time-series charts switch to WebGL and are down-sampled (0 disables)
+CHART_MAX_POINTS = int(os.environ.get('CHART_MAX_POINTS', 1000))
+
+# Threads building reports in the background, so the web server's threads only start jobs and poll them
+REPORT_WORKERS = int(os.environ.get('REPORT_WORKERS', 4))
+
+# Seconds a finished report job is kept for the pages polling it (its report stays in the result cache)
+JOB_RETENTION = int(os.environ.get('JOB_RETENTION', 60))
+
+# Kaleido processes kept running to export the plotly figures as PNG/SVG (e.g. for the PDF)
+STATIC_EXPORT_RENDERERS = int(os.environ.get('STATIC_EXPORT_RENDERERS', 2))
+
+# Builds each report's PDF in the background as soon as the report is complete, so the export returns it at once
+PDF_PRECOMPUTE = os.environ.get('PDF_PRECOMPUTE', '0') == '1'
+
+# Memory kept for finished PDFs (exported or built in the background)
+PDF_CACHE_BYTES = int(os.environ.get('PDF_CACHE_BYTES', 64 * 1024 * 1024))
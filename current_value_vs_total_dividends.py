@@ -1,7 +1,8 @@
 # Importing libraries
 
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+import plotly.graph_objs as go
 import matplotlib.ticker as ticker
     
 # CURRENT VALUE VS TOTAL DIVIDENDS BY ASSET
@@ -17,12 +18,13 @@ def current_value_vs_total_dividends(assets_and_investments, individual_current_
     width = 0.35
 
     # Creates the bar chart
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig = Figure(figsize=(10, 6))
+    ax = fig.add_subplot()
     rects1 = ax.bar(x - width/3, current_values, width=0.4, label='Current Value', color='cornflowerblue')
     rects2 = ax.bar(x + width/3, dividend_payments, width=0.4, label='Dividends', color='lightgreen')
 
     # Adds labels, title, and legend
-    plt.title('Current Value vs Total Dividends by Asset', loc='left', pad=20)
+    ax.set_title('Current Value vs Total Dividends by Asset', loc='left', pad=20)
     ax.set_xticks(x)
     ax.set_xticklabels(tickers)
     ax.legend()
@@ -41,16 +43,40 @@ def current_value_vs_total_dividends(assets_and_investments, individual_current_
     autolabel(rects2)
 
     # Rotates x labels for better readability
-    plt.xticks(rotation=45, ha='right')
+    ax.tick_params(axis='x', labelrotation=45)
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment('right')
     
     # Formats y-axis
     formatter = ticker.FuncFormatter(lambda x, _: '${:,.2f}'.format(x))
     ax.yaxis.set_major_formatter(formatter)
 
     # Removes axis lines
-    plt.gca().spines['top'].set_visible(False)
-    plt.gca().spines['right'].set_visible(False)
-    plt.gca().spines['left'].set_visible(False)
-    plt.tight_layout()
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.spines['left'].set_visible(False)
+    fig.tight_layout()
     
-    return fig
\ No newline at end of file
+    return fig
+
+# INTERACTIVE CURRENT VALUE VS TOTAL DIVIDENDS BY ASSET
+def plotly_current_value_vs_total_dividends(assets_and_investments, individual_current_value, dividend_values):
+
+    # Current value and dividends of each asset, side by side
+    tickers = list(assets_and_investments.keys())
+    current_values = [individual_current_value[ticker] for ticker in tickers]
+    dividend_payments = [dividend_values[ticker] for ticker in tickers]
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(x=tickers, y=current_values, name='Current Value', marker_color='cornflowerblue',
+                         text=['${:,.2f}'.format(value) for value in current_values], textposition='outside'))
+    fig.add_trace(go.Bar(x=tickers, y=dividend_payments, name='Dividends', marker_color='lightgreen',
+                         text=['${:,.2f}'.format(value) for value in dividend_payments], textposition='outside'))
+
+    fig.update_layout(title=dict(text='Current Value vs Total Dividends by Asset', x=0), height=420,
+                      template='plotly_white', barmode='group', hovermode='x unified', uniformtext=dict(minsize=10, mode='show'))
+    fig.update_xaxes(tickangle=-45)
+    # Leaves room above the tallest bar for its label
+    fig.update_yaxes(tickprefix='$', tickformat=',.2f', showgrid=False, range=[0, max(current_values + dividend_payments + [1]) * 1.15])
+
+    return fig
@@ -0,0 +1,94 @@
+# Importing libraries
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from datetime import date
+
+import pandas as pd
+
+from config import DIVIDEND_CACHE_PATH, DIVIDEND_TTL
+from market_data import get_provider
+from price_cache import invalidate
+
+# Serializes writes to the cache file when several requests refresh histories at once
+_write_lock = threading.Lock()
+
+def _connect():
+
+    # Creates the cache file and its tables on first use
+    os.makedirs(os.path.dirname(DIVIDEND_CACHE_PATH), exist_ok=True)
+    connection = sqlite3.connect(DIVIDEND_CACHE_PATH, timeout=30)
+    connection.execute('CREATE TABLE IF NOT EXISTS actions '
+                       '(ticker TEXT, date TEXT, dividend REAL, split REAL, PRIMARY KEY (ticker, date))')
+    # Stores the day and time each ticker's history was last brought up to date
+    connection.execute('CREATE TABLE IF NOT EXISTS refreshed '
+                       '(ticker TEXT PRIMARY KEY, refreshed_on TEXT, refreshed_at REAL)')
+    return connection
+
+def _store(connection, ticker, actions, replace):
+
+    with _write_lock, connection:
+        # A full download replaces the stored history (dividends are restated after a split)
+        if replace:
+            connection.execute('DELETE FROM actions WHERE ticker = ?', (ticker,))
+        connection.executemany('INSERT OR REPLACE INTO actions VALUES (?, ?, ?, ?)',
+                               [(ticker, day.strftime('%Y-%m-%d'), float(dividend), float(split))
+                                for day, dividend, split in actions[['Dividends', 'Stock Splits']].itertuples()])
+        connection.execute('INSERT OR REPLACE INTO refreshed VALUES (?, ?, ?)',
+                           (ticker, date.today().strftime('%Y-%m-%d'), time.time()))
+
+# DIVIDEND AND SPLIT HISTORY WITH LOCAL CACHE
+def get_actions(ticker):
+
+    with closing(_connect()) as connection:
+        refreshed = connection.execute('SELECT refreshed_on, refreshed_at FROM refreshed WHERE ticker = ?',
+                                       (ticker,)).fetchone()
+
+        # Downloads the full history the first time, then only the actions since the last refresh
+        if refreshed is None:
+            _store(connection, ticker, get_provider().get_actions(ticker), replace=True)
+        elif time.time() - refreshed[1] >= DIVIDEND_TTL:
+            try:
+                recent = get_provider().get_actions(ticker, start=refreshed[0])
+                known = {row[0] for row in connection.execute('SELECT date FROM actions WHERE ticker = ? AND date >= ?',
+                                                              (ticker, refreshed[0]))}
+                new_action = any(day.strftime('%Y-%m-%d') not in known for day in recent.index)
+                # A new split restates past dividends, so the whole history is downloaded again
+                new_split = (recent['Stock Splits'] != 0).any()
+                if new_split:
+                    recent = get_provider().get_actions(ticker)
+                _store(connection, ticker, recent, replace=new_split)
+
+                # A new dividend or split restates the adjusted prices, so the stored ones are downloaded again
+                if new_action:
+                    invalidate([ticker])
+            except Exception:
+                # Serves the stored history if the provider is unavailable
+                pass
+
+        stored = pd.read_sql_query('SELECT date, dividend, split FROM actions WHERE ticker = ? ORDER BY date',
+                                   connection, params=[ticker])
+
+    actions = pd.DataFrame({'Dividends': stored['dividend'].to_numpy(), 'Stock Splits': stored['split'].to_numpy()},
+                           index=pd.DatetimeIndex(pd.to_datetime(stored['date']), name='Date'))
+    return actions
+
+# Dividend history of one ticker as a series indexed by payment date
+def get_dividends(ticker):
+    actions = get_actions(ticker)
+    return actions.loc[actions['Dividends'] != 0, 'Dividends']
+
+# DIVIDENDS PAID IN A DATE RANGE
+# Returns the number of payments and the total dividend per share of every ticker, from a single slice
+def dividend_window(dividend_data, tickers, date_from, date_to):
+
+    # Aligns all dividend histories on one date index, one column per ticker
+    dividend_df = pd.concat(dividend_data, axis=1).reindex(columns=list(tickers))
+
+    # Keeps the payments within the specified period (both ends included)
+    window = dividend_df[(dividend_df.index >= date_from) & (dividend_df.index <= date_to)]
+
+    return window.count().astype(int), window.sum().fillna(0)
@@ -0,0 +1,77 @@
+# Importing libraries
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objs as go
+
+from config import CHART_MAX_POINTS
+
+# LARGEST-TRIANGLE-THREE-BUCKETS
+# Positions of the `threshold` points that best preserve the shape of each line; y holds one line per column
+# (all sharing x), so every line is reduced in the same pass. Returns an array of shape (threshold, lines)
+def lttb(x, y, threshold):
+
+    n, lines = y.shape
+    if threshold >= n or threshold < 3:
+        return np.repeat(np.arange(n)[:, None], lines, axis=1)
+
+    # First and last points are always kept, the rest is split into threshold - 2 buckets
+    every = (n - 2) / (threshold - 2)
+    indices = np.empty((threshold, lines), dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+
+    columns = np.arange(lines)
+    a = np.zeros(lines, dtype=np.int64)
+    for i in range(threshold - 2):
+        # Average of the next bucket
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean(axis=0)
+
+        # Keeps the point of this bucket forming the largest triangle with the last kept point and that average
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        x_a, y_a = x[a], y[a, columns]
+        areas = np.abs((x_a - avg_x) * (y[start:end] - y_a) - (x_a - x[start:end, None]) * (avg_y - y_a))
+        a = start + areas.argmax(axis=0)
+        indices[i + 1] = a
+
+    return indices
+
+# Down-samples every column of a time-series frame to max_points; returns {column: series}
+def downsample(frame, max_points):
+
+    if len(frame) == 0:
+        return {column: frame[column] for column in frame.columns}
+
+    # Days since the first date as x; gaps (before a line starts) are filled so they never win a bucket
+    x = (frame.index.asi8 - frame.index.asi8[0]) / 86400e9 if isinstance(frame.index, pd.DatetimeIndex) \
+        else np.arange(len(frame), dtype=float)
+    y = frame.bfill().ffill().fillna(0).to_numpy(dtype=float)
+    positions = lttb(x, y, max_points)
+
+    return {column: frame[column].iloc[np.unique(positions[:, i])].dropna() for i, column in enumerate(frame.columns)}
+
+# Whether a line is long enough to be drawn with WebGL and down-sampled
+def needs_downsampling(length, max_points=CHART_MAX_POINTS):
+    return 0 < max_points < length
+
+# LINE TRACES OF A TIME-SERIES FRAME (one per column)
+# Long lines are down-sampled to the point budget; within x_range (the zoomed window) another full budget
+# of points is used, so zooming in reloads the detail while the range slider still shows the whole line
+def line_traces(frame, x_range=None, max_points=CHART_MAX_POINTS):
+
+    if not needs_downsampling(len(frame), max_points):
+        return [go.Scatter(x=frame.index, y=frame[column], mode='lines', name=column) for column in frame.columns]
+
+    lines = downsample(frame, max_points)
+    if x_range is not None:
+        start, end = pd.Timestamp(x_range[0]), pd.Timestamp(x_range[1])
+        window = downsample(frame[(frame.index >= start) & (frame.index <= end)], max_points)
+        lines = {column: pd.concat([points[(points.index < start) | (points.index > end)], window[column]]).sort_index()
+                 for column, points in lines.items()}
+
+    # Plain arrays keep plotly from copying every date as an object
+    return [go.Scattergl(x=points.index.to_numpy(), y=points.to_numpy(), mode='lines', name=column)
+            for column, points in lines.items()]
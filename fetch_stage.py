@@ -0,0 +1,93 @@
+# Importing libraries
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+import pandas as pd
+from config import FETCH_CONCURRENCY, FETCH_MAX_WORKERS, FETCH_TIMEOUTS
+from dividend_store import get_dividends
+from latest_news import latest_news
+from portfolio_engine import compute_portfolio
+from price_cache import download_prices
+from ticker_metadata import get_ticker_metadata
+
+# Thread pool shared by every request, so the total number of open connections stays bounded
+_executor = ThreadPoolExecutor(max_workers=FETCH_MAX_WORKERS, thread_name_prefix='fetch')
+
+# Limits the per-ticker calls of each source running at the same time
+_limits = {source: threading.BoundedSemaphore(limit) for source, limit in FETCH_CONCURRENCY.items()}
+
+class FetchTimeout(Exception):
+    pass
+
+def _limited(source, function, *args):
+    with _limits[source]:
+        return function(*args)
+
+def _metadata(ticker):
+    return get_ticker_metadata([ticker])
+
+def _news(prices_future, assets_and_investments):
+
+    # News is fetched for the asset with the biggest current value, so it waits for the prices; the values come
+    # from the portfolio engine, which uses each asset's last valid price (the last day may be a benchmark-only day)
+    df = prices_future.result(timeout=FETCH_TIMEOUTS['prices'])
+    return latest_news(compute_portfolio(df, assets_and_investments).as_dict('current_values'))
+
+def _result(future, source, deadline):
+
+    # Waits for a source until its own deadline, measured from the start of the fetch stage
+    try:
+        return future.result(timeout=max(deadline[source] - time.monotonic(), 0))
+    except TimeoutError:
+        raise FetchTimeout(f'Timed out while fetching {source}!')
+
+# DOWNLOADS STARTED FOR ONE REQUEST
+# All sources are requested at once; each result can then be collected as soon as it is needed, so the
+# report can be shown in stages (prices and dividends first, metadata and news later)
+class PendingFetch:
+
+    def __init__(self, assets_and_investments, benchmark, date_from, date_to):
+        self.tickers = list(assets_and_investments.keys())
+        self.benchmark = benchmark
+        started = time.monotonic()
+        self.deadline = {source: started + timeout for source, timeout in FETCH_TIMEOUTS.items()}
+
+        # Starts all independent downloads at once (assets and benchmark share one price download)
+        self.prices_future = _executor.submit(download_prices, list(dict.fromkeys(self.tickers + [benchmark])), date_from, date_to)
+        self.news_future = _executor.submit(_news, self.prices_future, assets_and_investments)
+        self.dividend_futures = {ticker: _executor.submit(_limited, 'dividends', get_dividends, ticker) for ticker in self.tickers}
+        self.metadata_futures = [_executor.submit(_limited, 'metadata', _metadata, ticker) for ticker in self.tickers]
+
+    # Prices of the assets, prices of the benchmark and dividend histories
+    def market_data(self):
+        prices = _result(self.prices_future, 'prices', self.deadline)
+        dividends = {ticker: _result(future, 'dividends', self.deadline) for ticker, future in self.dividend_futures.items()}
+        return prices[self.tickers], prices[self.benchmark], dividends
+
+    def metadata(self):
+        return pd.concat([_result(future, 'metadata', self.deadline) for future in self.metadata_futures])
+
+    def news(self):
+
+        # News is not essential, the report is still built without it
+        try:
+            return _result(self.news_future, 'news', self.deadline)
+        except Exception:
+            return [], self.tickers[0]
+
+# FETCH STAGE FOR A UNIVERSE OF TICKERS (prices and dividends only, shared by many portfolios)
+def fetch_universe(tickers, date_from, date_to):
+
+    tickers = list(dict.fromkeys(tickers))
+    started = time.monotonic()
+    deadline = {source: started + timeout for source, timeout in FETCH_TIMEOUTS.items()}
+
+    prices_future = _executor.submit(download_prices, tickers, date_from, date_to)
+    dividend_futures = {ticker: _executor.submit(_limited, 'dividends', get_dividends, ticker) for ticker in tickers}
+
+    prices = _result(prices_future, 'prices', deadline)
+    dividends = {ticker: _result(future, 'dividends', deadline) for ticker, future in dividend_futures.items()}
+
+    return prices, dividends
@@ -1,20 +1,14 @@
 # Importing libraries
 
-import pandas as pd
 import plotly.graph_objs as go
+
+from downsampling import line_traces
     
 # INDIVIDUAL ASSET PERFORMANCE
-def individual_asset_performance(initial_assets_weights, df):
+def individual_asset_performance(individual_cumsum, x_range=None):
 
-    # Starts DataFrame and Series
-    individual_cumsum = pd.DataFrame()
-    
-    # Iterates through tickers and weights in the tickers_weights dictionary
-    for ticker, weight in initial_assets_weights.items():
-        if ticker in df.columns:  # Confirms that the tickers are available
-            individual_returns = df[ticker].pct_change()  # Computes individual daily returns for each ticker
-            individual_cumsum[ticker] = ((1 + individual_returns).cumprod() - 1)   # Computes cumulative returns over the period for each ticker
-            
+    # individual_cumsum holds the cumulative returns of each asset (one column per ticker);
+    # x_range is the zoomed window shown in full detail when the lines are down-sampled
     fig_individual = go.Figure(
         layout = go.Layout(
             title=go.layout.Title(text = "Individual Asset Performance")
@@ -22,14 +16,10 @@ def individual_asset_performance(initial_assets_weights, df):
         )
             
     # Adds cumulative returns of each individual asset to the plot
-    for ticker in individual_cumsum.columns:
-         fig_individual.add_trace(go.Scatter(x=individual_cumsum.index,
-                                  y=individual_cumsum[ticker],
-                                  mode = 'lines',
-                                  name = ticker))
+    fig_individual.add_traces(line_traces(individual_cumsum, x_range))
         
     # Adjusts the layout to make the graph larger vertically and changes the title of the legend
-    fig_individual.update_layout(height=420,legend_title="Assets",template = 'plotly_white',hovermode='x unified')
+    fig_individual.update_layout(height=420,legend_title="Assets",template = 'plotly_white',hovermode='x unified',uirevision='zoom')
 
     # Adds the historical returns for each ticker on the plot    
     fig_individual.update_yaxes(title_text='Cumulative Returns',
@@ -48,5 +38,7 @@ def individual_asset_performance(initial_assets_weights, df):
             ])
         )
     )
+    if x_range is not None:
+        fig_individual.update_xaxes(range=x_range)
     
     return fig_individual
\ No newline at end of file
@@ -1,6 +1,6 @@
 # Importing libraries
 
-import yfinance as yf
+from market_data import get_provider
 
 # MOST CURRENT NEWS FOR THE ASSET WITH THE HIGHEST CURRENT VALUE
 def latest_news(individual_current_value):
@@ -8,10 +8,7 @@ def latest_news(individual_current_value):
     # Finds the asset with the biggest current value
     max_value_ticker = max(individual_current_value, key=individual_current_value.get)
 
-    # Creates a Ticker object for the asset
-    asset_ticker = yf.Ticker(max_value_ticker)
-
     # Gets the latest news headlines
-    news_headlines = asset_ticker.news
+    news_headlines = get_provider().get_news(max_value_ticker)
     
     return news_headlines, max_value_ticker
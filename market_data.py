@@ -0,0 +1,218 @@
+# Importing libraries
+
+import argparse
+import json
+import os
+import threading
+import zlib
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from config import LOCAL_DATA_DIR, MARKET_DATA_PROVIDER
+
+# MARKET DATA PROVIDERS
+# Every module obtains prices, dividends, metadata and news through get_provider(), never from yfinance directly
+
+class MarketDataProvider:
+
+    name = None
+
+    # Daily prices as a dataframe with dates as rows and tickers as columns (end date excluded)
+    def get_prices(self, tickers, date_from, date_to):
+        raise NotImplementedError
+
+    # Dividends and stock splits as a dataframe with 'Dividends' and 'Stock Splits' columns indexed by date,
+    # only rows with an action, from `start` (yyyy-mm-dd) or from the beginning of the history
+    def get_actions(self, ticker, start=None):
+        raise NotImplementedError
+
+    # Full dividend history as a series indexed by payment date
+    def get_dividends(self, ticker):
+        actions = self.get_actions(ticker)
+        return actions.loc[actions['Dividends'] != 0, 'Dividends']
+
+    # Dictionary with at least the 'country', 'industry' and 'sector' keys
+    def get_info(self, ticker):
+        raise NotImplementedError
+
+    # List of news items, each a dictionary with at least a 'title' key
+    def get_news(self, ticker):
+        raise NotImplementedError
+
+class YahooProvider(MarketDataProvider):
+
+    name = 'yahoo'
+
+    def __init__(self):
+        # yf.download keeps its results in module-level state, so concurrent calls must not overlap
+        self._download_lock = threading.Lock()
+
+    def get_prices(self, tickers, date_from, date_to):
+
+        # Obtains assets' data with yfinance
+        with self._download_lock:
+            data = yf.download(tickers=tickers, start=date_from, end=date_to)
+        if len(data) == 0:
+            return pd.DataFrame(columns=tickers, dtype=float)
+
+        # If 'Adjusted Close' is not available, uses 'Close'
+        if isinstance(data.columns, pd.MultiIndex):
+            adjusted = data['Adj Close'] if 'Adj Close' in data.columns.get_level_values(0) else data['Close']
+            prices = adjusted.fillna(data['Close'])
+        else:
+            adjusted = data['Adj Close'] if 'Adj Close' in data.columns else data['Close']
+            prices = adjusted.fillna(data['Close']).to_frame(tickers[0])
+
+        return prices.reindex(columns=tickers)
+
+    def get_actions(self, ticker, start=None):
+
+        # Full history in one call, or only the recent rows when refreshing a stored history
+        if start is None:
+            actions = yf.Ticker(ticker).actions
+        else:
+            actions = yf.Ticker(ticker).history(start=start, actions=True)
+        actions = actions.reindex(columns=['Dividends', 'Stock Splits']).fillna(0)
+
+        return actions[(actions['Dividends'] != 0) | (actions['Stock Splits'] != 0)]
+
+    def get_info(self, ticker):
+        return yf.Ticker(ticker).info
+
+    def get_news(self, ticker):
+        return yf.Ticker(ticker).news
+
+class LocalProvider(MarketDataProvider):
+
+    name = 'local'
+
+    # Synthetic histories all start here, so a given ticker and date always get the same price
+    SYNTHETIC_START = '2000-01-03'
+    COUNTRIES = ['United States', 'United Kingdom', 'Germany', 'Japan', 'Switzerland']
+    INDUSTRIES = ['Software', 'Banks', 'Oil & Gas', 'Pharmaceuticals', 'Semiconductors', 'Retail', 'Utilities']
+    SECTORS = ['Technology', 'Financial Services', 'Energy', 'Healthcare', 'Technology', 'Consumer Cyclical', 'Utilities']
+
+    def __init__(self, data_dir=LOCAL_DATA_DIR):
+        self.data_dir = data_dir
+
+    def _seed(self, ticker):
+        # Stable across processes, unlike hash()
+        return zlib.crc32(ticker.encode('utf-8'))
+
+    def _read_fixture(self, folder, ticker):
+
+        # Reads <data_dir>/<folder>/<ticker>.parquet or .csv, whichever exists
+        for extension, reader in (('.parquet', pd.read_parquet), ('.csv', lambda path: pd.read_csv(path, index_col=0))):
+            path = os.path.join(self.data_dir, folder, ticker + extension)
+            if os.path.exists(path):
+                fixture = reader(path)
+                fixture.index = pd.to_datetime(fixture.index)
+                return fixture.iloc[:, 0]
+        return None
+
+    def _synthetic_prices(self, ticker, date_to):
+
+        # Geometric random walk over business days, drawn from a generator seeded by the ticker
+        dates = pd.bdate_range(self.SYNTHETIC_START, date_to)
+        rng = np.random.default_rng(self._seed(ticker))
+        # The level is drawn before the daily returns, so it does not depend on how many days are drawn after it
+        drift, volatility, level = rng.uniform(-0.0002, 0.0006), rng.uniform(0.008, 0.025), rng.uniform(20, 400)
+        returns = rng.normal(drift, volatility, len(dates))
+        return pd.Series(level * np.exp(np.cumsum(returns)), index=dates)
+
+    def get_prices(self, tickers, date_from, date_to):
+
+        prices = {}
+        for ticker in tickers:
+            series = self._read_fixture('prices', ticker)
+            if series is None:
+                series = self._synthetic_prices(ticker, date_to)
+            prices[ticker] = series[(series.index >= date_from) & (series.index < date_to)]
+
+        return pd.DataFrame(prices).reindex(columns=list(tickers))
+
+    def get_actions(self, ticker, start=None):
+
+        dividends = self._read_fixture('dividends', ticker)
+
+        # Two tickers out of three pay a steady quarterly dividend
+        if dividends is None:
+            seed = self._seed(ticker)
+            dates = pd.date_range(self.SYNTHETIC_START, pd.Timestamp.today(), freq='QS') + pd.Timedelta(days=14)
+            dividends = pd.Series(0.1 + (seed % 50) / 100 if seed % 3 else 0.0, index=dates)
+
+        # Fixtures and synthetic data have no stock splits
+        actions = pd.DataFrame({'Dividends': dividends, 'Stock Splits': 0.0})
+        actions = actions[actions['Dividends'] != 0]
+        if start is not None:
+            actions = actions[actions.index >= start]
+
+        return actions
+
+    def get_info(self, ticker):
+
+        # <data_dir>/metadata.csv has one row per ticker with country, industry and sector columns
+        path = os.path.join(self.data_dir, 'metadata.csv')
+        if os.path.exists(path):
+            metadata = pd.read_csv(path, index_col=0)
+            if ticker in metadata.index:
+                return metadata.loc[ticker].to_dict()
+
+        seed = self._seed(ticker)
+        return {'country': self.COUNTRIES[seed % len(self.COUNTRIES)],
+                'industry': self.INDUSTRIES[seed % len(self.INDUSTRIES)],
+                'sector': self.SECTORS[seed % len(self.SECTORS)]}
+
+    def get_news(self, ticker):
+
+        # <data_dir>/news/<ticker>.json holds a list of news items
+        path = os.path.join(self.data_dir, 'news', ticker + '.json')
+        if os.path.exists(path):
+            with open(path) as file:
+                return json.load(file)
+
+        return [{'title': f'{ticker} headline {number}'} for number in range(1, 9)]
+
+PROVIDERS = {provider.name: provider for provider in (YahooProvider, LocalProvider)}
+_provider = None
+
+def get_provider():
+
+    # Creates the configured provider once per process
+    global _provider
+    if _provider is None:
+        if MARKET_DATA_PROVIDER not in PROVIDERS:
+            raise ValueError(f'Unknown market data provider {MARKET_DATA_PROVIDER!r}, expected one of {sorted(PROVIDERS)}')
+        _provider = PROVIDERS[MARKET_DATA_PROVIDER]()
+    return _provider
+
+# Records the configured provider's data as fixture files, so a run can later be replayed offline
+def save_fixtures(tickers, date_from, date_to, data_dir=LOCAL_DATA_DIR):
+
+    provider = get_provider()
+    for folder in ('prices', 'dividends', 'news'):
+        os.makedirs(os.path.join(data_dir, folder), exist_ok=True)
+
+    prices = provider.get_prices(tickers, date_from, date_to)
+    metadata = {}
+    for ticker in tickers:
+        prices[ticker].dropna().rename('Price').to_csv(os.path.join(data_dir, 'prices', ticker + '.csv'))
+        provider.get_dividends(ticker).rename('Dividends').to_csv(os.path.join(data_dir, 'dividends', ticker + '.csv'))
+        headlines = [{'title': news['title']} for news in provider.get_news(ticker)]
+        with open(os.path.join(data_dir, 'news', ticker + '.json'), 'w') as file:
+            json.dump(headlines, file)
+        info = provider.get_info(ticker)
+        metadata[ticker] = {field: info.get(field) for field in ('country', 'industry', 'sector')}
+
+    pd.DataFrame.from_dict(metadata, orient='index').to_csv(os.path.join(data_dir, 'metadata.csv'))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Saves market data as fixture files for the local provider.')
+    parser.add_argument('tickers', nargs='+')
+    parser.add_argument('--start', required=True, help='yyyy-mm-dd')
+    parser.add_argument('--end', required=True, help='yyyy-mm-dd')
+    parser.add_argument('--out', default=LOCAL_DATA_DIR)
+    args = parser.parse_args()
+    save_fixtures(args.tickers, args.start, args.end, args.out)
@@ -1,13 +1,10 @@
 # Importing libraries
 
 import pandas as pd
-import yfinance as yf
 
-# OVERVIEW TABLE
-def overview_table(assets_and_investments, df, dividend_values, dividend_count, 
-                   initial_total_portfolio_value, date_to, date_from, 
-                   individual_current_value, capital_gains, net_profit_loss, 
-                   portfolio_current_value, portfolio_capital_gains, portfolio_net_gains):
+# OVERVIEW METRICS
+def overview_metrics(dividend_values, dividend_count, individual_current_value, capital_gains, net_profit_loss, 
+                     portfolio_current_value, portfolio_capital_gains, portfolio_net_gains):
     
     # Leaves the Ticker name and the value in a dataframe format
     individual_current_value_df = pd.DataFrame(list(individual_current_value.items()), columns=['Ticker', 'Current Value']) 
@@ -39,6 +36,35 @@ def overview_table(assets_and_investments, df, dividend_values, dividend_count,
     overview_table.loc['Portfolio'] = [portfolio_current_value, portfolio_capital_gains, 
                                         portfolio_net_gains, portfolio_dividend_count, portfolio_total_dividend_value]
     
+    return overview_table
+
+# Columns colored green or red by their sign
+COLORED_COLUMNS = ['Capital Gains', 'Net Profit/Loss']
+
+# Number behind a formatted value of the table
+def formatted_to_number(value):
+    return float(value.replace('%', '').replace('$', '').replace(',', ''))
+
+# Text color of a (possibly formatted) value
+def value_color(value):
+    if isinstance(value, str):  # Checks if value is already formatted
+        value = formatted_to_number(value)  # Converts to float
+    if value > 0:
+        return 'limegreen'
+    elif value < 0:
+        return 'red'
+    return 'black'
+
+# OVERVIEW TABLE
+def overview_table(assets_and_investments, df, dividend_values, dividend_count, 
+                   initial_total_portfolio_value, date_to, date_from, 
+                   individual_current_value, capital_gains, net_profit_loss, 
+                   portfolio_current_value, portfolio_capital_gains, portfolio_net_gains):
+    
+    # Obtains the unformatted values of the table
+    overview_table = overview_metrics(dividend_values, dividend_count, individual_current_value, capital_gains, 
+                                      net_profit_loss, portfolio_current_value, portfolio_capital_gains, portfolio_net_gains)
+    
     # Sets the index name to an empty string
     overview_table.index.name = ''
 
@@ -51,20 +77,12 @@ def overview_table(assets_and_investments, df, dividend_values, dividend_count,
     
     # Styles and aligns the table
     def color_positive_negative(value):
-        if isinstance(value, str):  # Checks if value is already formatted
-            value = float(value.replace('%', '').replace('$', '').replace(',', ''))  # Converts to float
-        if value > 0:
-            color = 'limegreen'
-        elif value < 0:
-            color = 'red'
-        else:
-            color = 'black'
-        return 'color: %s' % color
+        return 'color: %s' % value_color(value)
     
     # Styles and aligns the table
     overview_table_formatted = overview_table.style \
     .set_properties(**{'text-align': 'center'}) \
-    .applymap(color_positive_negative, subset=['Capital Gains', 'Net Profit/Loss'])
+    .applymap(color_positive_negative, subset=COLORED_COLUMNS)
     
     # Defines custom CSS to adjust the position of the column names
     custom_css = [
@@ -0,0 +1,143 @@
+# Importing libraries
+
+import hashlib
+import struct
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from fpdf import FPDF
+
+from config import PDF_CACHE_BYTES
+from chart_rendering import render_missing_charts
+from result_cache import LRUCache, result_ttl
+from utils import build_pdf, PDF_CHARTS
+
+# Finished PDFs by result key, the least recently exported evicted first once they exceed PDF_CACHE_BYTES
+pdfs = LRUCache(max_entries=float('inf'), max_size=PDF_CACHE_BYTES)
+
+# Background thread building PDFs ahead of the export, and the builds in flight by result key
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pdf')
+_pending = {}
+_lock = threading.Lock()
+
+# PDF WHOSE IMAGES ARE GIVEN AS BYTES
+# fpdf 1.7 reads PNG images from files by name; images placed with image_bytes are parsed from memory instead,
+# so a PDF is built without writing anything to disk
+class MemoryPDF(FPDF):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.memory_images = {}
+
+    # Places PNG bytes on the page; the same bytes placed twice are embedded once
+    def image_bytes(self, data, x=None, y=None, w=0, h=0):
+        name = f'memory-{hashlib.sha256(data).hexdigest()}.png'
+        self.memory_images[name] = data
+        self.image(name, x, y, w, h)
+
+    def _parsepng(self, name):
+        if name not in self.memory_images:
+            return super()._parsepng(name)
+        return self._parse_png_bytes(self.memory_images.pop(name))
+
+    # Same result as fpdf's PNG parser, but the alpha channel is split with NumPy instead of one regex per row
+    def _parse_png_bytes(self, data):
+
+        if data[:8] != b'\x89PNG\r\n\x1a\n':
+            self.error('Not a PNG image')
+        w, h, bpc, ct, compression, filtering, interlace = struct.unpack('>IIBBBBB', data[16:29])
+        if bpc > 8:
+            self.error('16-bit depth not supported')
+        if ct not in (0, 2, 3, 4, 6) or compression or filtering:
+            self.error('Unsupported PNG image')
+        if interlace:
+            self.error('Interlacing not supported')
+        colspace = {0: 'DeviceGray', 2: 'DeviceRGB', 3: 'Indexed', 4: 'DeviceGray', 6: 'DeviceRGB'}[ct]
+
+        # Collects the palette, the transparency and the image data chunks
+        pal, trns, chunks, pos = '', '', [], 8
+        while pos < len(data):
+            length, kind = struct.unpack('>I4s', data[pos:pos + 8])
+            body = data[pos + 8:pos + 8 + length]
+            if kind == b'PLTE':
+                pal = body
+            elif kind == b'tRNS':
+                if ct == 0:
+                    trns = [body[1]]
+                elif ct == 2:
+                    trns = [body[1], body[3], body[5]]
+                elif body.find(b'\x00') != -1:
+                    trns = [body.find(b'\x00')]
+            elif kind == b'IDAT':
+                chunks.append(body)
+            elif kind == b'IEND':
+                break
+            pos += length + 12
+        if colspace == 'Indexed' and not pal:
+            self.error('Missing palette')
+
+        info = {'w': w, 'h': h, 'cs': colspace, 'bpc': bpc, 'f': 'FlateDecode',
+                'dp': f'/Predictor 15 /Colors {3 if colspace == "DeviceRGB" else 1} /BitsPerComponent {bpc} /Columns {w}',
+                'pal': pal, 'trns': trns}
+        data = b''.join(chunks)
+
+        # Moves the alpha channel to its own image; each row keeps its filter byte, which stays valid for both
+        # halves since PNG filters work channel by channel
+        if ct >= 4:
+            channels = 2 if ct == 4 else 4
+            rows = np.frombuffer(zlib.decompress(data), dtype=np.uint8).reshape(h, 1 + channels * w)
+            pixels = rows[:, 1:].reshape(h, w, channels)
+            data = zlib.compress(np.hstack([rows[:, :1], pixels[:, :, :-1].reshape(h, -1)]).tobytes())
+            info['smask'] = zlib.compress(np.hstack([rows[:, :1], pixels[:, :, -1]]).tobytes())
+            if self.pdf_version < '1.4':
+                self.pdf_version = '1.4'
+
+        info['data'] = data
+        return info
+
+# BUILDS THE PDF OF A COMPLETE REPORT
+def build_report_pdf(context):
+
+    pdf = MemoryPDF(orientation='L')
+
+    # The PDF embeds the matplotlib images, drawn now if the page showed plotly charts
+    render_missing_charts(context, PDF_CHARTS)
+    build_pdf(pdf, context)
+
+    return pdf.output(dest = 'S').encode('latin-1')
+
+def _build_and_store(context):
+    try:
+        data = build_report_pdf(context)
+        pdfs.put(context['key'], data, ttl=result_ttl(context['end_date']))
+        return data
+    finally:
+        with _lock:
+            _pending.pop(context['key'], None)
+
+# STARTS BUILDING THE PDF OF A REPORT IN THE BACKGROUND, unless it is stored or already being built
+def precompute_pdf(context):
+    key = context['key']
+    with _lock:
+        if key not in _pending and pdfs.get(key) is None:
+            _pending[key] = _executor.submit(_build_and_store, context)
+
+# PDF BYTES OF A REPORT
+# The stored PDF if there is one, the background build if it is still running, otherwise built now
+def report_pdf(context):
+
+    data = pdfs.get(context['key'])
+    if data is not None:
+        return data
+
+    with _lock:
+        future = _pending.get(context['key'])
+    if future is not None:
+        try:
+            return future.result()
+        except Exception:
+            pass
+
+    return _build_and_store(context)
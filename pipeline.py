@@ -0,0 +1,113 @@
+# Importing libraries
+
+from dataclasses import dataclass
+
+from config import CHART_BACKEND
+from fetch_stage import PendingFetch, FetchTimeout
+from portfolio_engine import PortfolioResult, compute_portfolio, compute_value_series
+from allocation_engine import compute_allocations
+from dividend_store import dividend_window
+from individual_asset_performance import individual_asset_performance
+from portfolio_performance_vs_benchmark import portfolio_performance_vs_benchmark
+from overview_table import overview_table
+from table_rendering import render_table
+from chart_rendering import INITIAL_CHARTS, chart_specs, render_charts
+
+# A report that cannot be built, with the message shown to the user
+class ReportError(Exception):
+    pass
+
+# A report whose performance part is ready; the allocation part still waits for metadata and news
+@dataclass
+class PendingReport:
+    key: str
+    fetch: PendingFetch
+    assets_and_investments: dict
+    portfolio: PortfolioResult
+    dividend_values: dict
+    table: object
+    context: dict
+
+# STAGE 1: PERFORMANCE CHARTS AND OVERVIEW TABLE
+# Needs only prices and dividends; metadata and news keep downloading in the background.
+# Every call downloads afresh (identical requests in flight already share one report job), so a failed
+# download is retried on the next Submit
+def build_performance_stage(key, assets_and_investments, benchmark, date_from, date_to):
+
+    fetch = PendingFetch(assets_and_investments, benchmark, date_from, date_to)
+
+    try:
+        df, benchmark_prices, dividends = fetch.market_data()
+    except FetchTimeout as error:
+        raise ReportError(str(error))
+
+    # If one or all tickers given start after start date given, do not do anything!
+    if len(df) == 0:
+        raise ReportError("Data unavailable for one or all selected tickers for the given date range!")
+
+    for ticker in assets_and_investments.keys():
+        first_valid_index = df[ticker].first_valid_index()
+        if first_valid_index is None or first_valid_index.strftime('%Y-%m-%d') > date_from:
+            raise ReportError("Data unavailable for one or all selected tickers for the given date range!")
+
+    # Calculates shares, current values, gains and weights of every asset and of the portfolio in one pass
+    portfolio = compute_portfolio(df, assets_and_investments)
+
+    # Computes the daily value and cumulative returns of the portfolio (shares times prices) and of each asset
+    portfolio_series = compute_value_series(df[portfolio.tickers], portfolio.shares)
+
+    # Computes benchmark cumulative returns the same way, as a single share of the benchmark
+    benchmark_series = compute_value_series(benchmark_prices.to_frame(), [1.0])
+
+    # Counts the dividend payments and sums the dividends per share of every asset within the selected period
+    dividend_payments, dividends_per_share = dividend_window(dividends, portfolio.tickers, date_from, date_to)
+    dividend_count = dividend_payments.to_frame('Dividend Payments')
+
+    # Calculates the total value generated by all dividend payments for each asset (shares bought times dividends per share)
+    dividend_values = dict(zip(portfolio.tickers, (dividends_per_share.to_numpy() * portfolio.shares).tolist()))
+
+    # Creates the performance figures and the table
+    fig_1 = individual_asset_performance(portfolio_series.asset_cumulative_returns)
+    fig_2 = portfolio_performance_vs_benchmark(portfolio_series.cumulative_returns, benchmark_series.cumulative_returns)
+    table_1 = overview_table(assets_and_investments, df, dividend_values, dividend_count, portfolio.initial_total_value,
+                             date_to, date_from, portfolio.as_dict('current_values'), portfolio.as_dict('capital_gains'),
+                             portfolio.as_dict('net_profit_loss'), portfolio.current_total_value,
+                             portfolio.total_capital_gains, portfolio.net_gains)
+
+    context = {'fig_1': fig_1,
+               'fig_2': fig_2,
+               'table_1': render_table(table_1),
+               'series_1': portfolio_series.asset_cumulative_returns,
+               'series_2': (portfolio_series.cumulative_returns, benchmark_series.cumulative_returns),
+               'key': key,
+               'start_date': date_from,
+               'end_date': date_to
+               }
+
+    return PendingReport(key=key, fetch=fetch, assets_and_investments=assets_and_investments, portfolio=portfolio,
+                         dividend_values=dividend_values, table=table_1, context=context)
+
+# STAGE 2: ALLOCATION CHARTS, DIVIDEND CHART AND NEWS
+# Completes the report's context; the initial allocation charts are only described, to be drawn on demand
+def build_allocation_stage(report):
+
+    try:
+        metadata = report.fetch.metadata()
+    except FetchTimeout as error:
+        raise ReportError(str(error))
+    headlines, max_value_ticker = report.fetch.news()
+
+    # Computes every country/industry breakdown of the initial and current weights in one pass
+    initial_assets_weights = report.portfolio.as_dict('initial_weights')
+    current_assets_weights = report.portfolio.as_dict('current_weights')
+    allocations = compute_allocations(metadata, initial_assets_weights, current_assets_weights)
+
+    # Draws the matplotlib charts in worker processes from plain data
+    # (with plotly charts on the page, the images are only drawn if the PDF is exported)
+    specs = chart_specs(report.assets_and_investments, initial_assets_weights, current_assets_weights, allocations,
+                        report.portfolio.as_dict('current_values'), report.dividend_values)
+    if CHART_BACKEND == 'matplotlib':
+        report.context.update(render_charts({name: job for name, job in specs.items() if name not in INITIAL_CHARTS}))
+
+    report.context.update({'chart_specs': specs, 'headlines': headlines, 'max_value_ticker': max_value_ticker})
+    return report.context
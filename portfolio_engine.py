@@ -0,0 +1,128 @@
+# Importing libraries
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Per-asset figures are NumPy arrays aligned with `tickers`, portfolio figures are floats
+@dataclass
+class PortfolioResult:
+    tickers: list
+    investments: np.ndarray
+    shares: np.ndarray
+    first_prices: np.ndarray
+    last_prices: np.ndarray
+    current_values: np.ndarray
+    net_profit_loss: np.ndarray
+    capital_gains: np.ndarray
+    initial_weights: np.ndarray
+    current_weights: np.ndarray
+    initial_total_value: float
+    current_total_value: float
+    net_gains: float
+    total_capital_gains: float
+
+    # Returns a per-asset figure as a {ticker: value} dictionary, as the chart modules expect
+    def as_dict(self, field):
+        return dict(zip(self.tickers, getattr(self, field).tolist()))
+
+# Figures of many portfolios over the same tickers: per-asset figures are (portfolios x tickers) matrices,
+# portfolio figures are arrays with one value per portfolio
+@dataclass
+class PortfolioMatrix:
+    shares: np.ndarray
+    first_prices: np.ndarray
+    last_prices: np.ndarray
+    current_values: np.ndarray
+    net_profit_loss: np.ndarray
+    capital_gains: np.ndarray
+    initial_total_values: np.ndarray
+    current_total_values: np.ndarray
+    net_gains: np.ndarray
+    total_capital_gains: np.ndarray
+
+# Daily series of a buy-and-hold position in every column of a price panel
+@dataclass
+class ValueSeries:
+    values: pd.Series
+    returns: pd.Series
+    cumulative_returns: pd.Series
+    asset_cumulative_returns: pd.DataFrame
+
+# PORTFOLIO ENGINE FOR MANY PORTFOLIOS
+# prices is a (days x tickers) array, investments a (portfolios x tickers) matrix with 0 for the tickers a
+# portfolio does not hold; every portfolio is evaluated at once as matrix operations
+def compute_portfolios(prices, investments):
+
+    # First price of the period and last price available for each ticker
+    first_prices = prices[0]
+    last_rows = prices.shape[0] - 1 - np.argmax(~np.isnan(prices[::-1]), axis=0)
+    last_prices = prices[last_rows, np.arange(prices.shape[1])]
+
+    # Calculates shares bought, current value, net profit and capital gain of each holding at once
+    with np.errstate(divide='ignore', invalid='ignore'):
+        shares = np.where(investments > 0, investments / first_prices, 0)
+        # (a ticker without prices in the period is NaN, and must not spread to the portfolios not holding it)
+        current_values = np.where(investments > 0, shares * last_prices, 0)
+        net_profit_loss = current_values - investments
+        capital_gains = net_profit_loss / investments * 100
+
+        # Calculates the totals of each portfolio
+        initial_total_values = investments.sum(axis=1)
+        current_total_values = current_values.sum(axis=1)
+        net_gains = current_total_values - initial_total_values
+        total_capital_gains = net_gains / initial_total_values * 100
+
+    return PortfolioMatrix(shares=shares, first_prices=first_prices, last_prices=last_prices,
+                           current_values=current_values, net_profit_loss=net_profit_loss, capital_gains=capital_gains,
+                           initial_total_values=initial_total_values, current_total_values=current_total_values,
+                           net_gains=net_gains, total_capital_gains=total_capital_gains)
+
+# PORTFOLIO ENGINE
+def compute_portfolio(df, assets_and_investments):
+
+    # Aligns holdings and prices on the same ticker order
+    tickers = list(assets_and_investments.keys())
+    investments = np.array([assets_and_investments[ticker] for ticker in tickers], dtype=float)
+
+    # A single portfolio is the one-row case of the matrix engine
+    matrix = compute_portfolios(df[tickers].to_numpy(dtype=float), investments[np.newaxis])
+    current_values = matrix.current_values[0]
+    initial_total_value = matrix.initial_total_values[0]
+    current_total_value = matrix.current_total_values[0]
+
+    return PortfolioResult(tickers=tickers, investments=investments, shares=matrix.shares[0],
+                           first_prices=matrix.first_prices, last_prices=matrix.last_prices,
+                           current_values=current_values, net_profit_loss=matrix.net_profit_loss[0],
+                           capital_gains=matrix.capital_gains[0],
+                           initial_weights=investments / initial_total_value,
+                           current_weights=current_values / current_total_value,
+                           initial_total_value=float(initial_total_value),
+                           current_total_value=float(current_total_value),
+                           net_gains=float(matrix.net_gains[0]),
+                           total_capital_gains=float(matrix.total_capital_gains[0]))
+
+# PORTFOLIO VALUE SERIES
+def compute_value_series(df, shares):
+
+    # Carries the last price over days when one of the exchanges was closed
+    prices = df.ffill().to_numpy(dtype=float)
+
+    # Daily portfolio value as a single shares-times-prices product, for any number of assets
+    values = prices @ np.asarray(shares, dtype=float)
+
+    # Cumulative returns of the portfolio and of each asset against their first valid value, so a series that
+    # starts later than the panel (e.g. a benchmark closed on the first day) is not all NaN
+    first_prices = prices[np.argmax(~np.isnan(prices), axis=0), np.arange(prices.shape[1])]
+    first_value = values[np.argmax(~np.isnan(values))]
+    cumulative_returns = values / first_value - 1
+    asset_cumulative_returns = prices / first_prices - 1
+    returns = np.empty_like(values)
+    returns[0] = np.nan
+    returns[1:] = values[1:] / values[:-1] - 1
+
+    return ValueSeries(values=pd.Series(values, index=df.index),
+                       returns=pd.Series(returns, index=df.index),
+                       cumulative_returns=pd.Series(cumulative_returns, index=df.index),
+                       asset_cumulative_returns=pd.DataFrame(asset_cumulative_returns, index=df.index, columns=df.columns))
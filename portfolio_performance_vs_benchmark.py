@@ -1,29 +1,23 @@
 # Importing libraries
 
+import pandas as pd
 import plotly.express as px
-import plotly.graph_objs as go
+
+from downsampling import line_traces
     
 # PORTFOLIO PERFORMANCE VS BENCHMARK
-def portfolio_performance_vs_benchmark(portfolio_returns, benchmark_returns):
-    
-    # Computes the cumulative returns for the portfolio and the benchmark
-    portfolio_cumsum = ((1 + portfolio_returns).cumprod() - 1) 
-    benchmark_cumsum = ((1 + benchmark_returns).cumprod() - 1) 
+def portfolio_performance_vs_benchmark(portfolio_cumsum, benchmark_cumsum, x_range=None):
     
+    # Receives the cumulative returns of the portfolio and of the benchmark
+    # (and the zoomed window shown in full detail when the lines are down-sampled)
     fig_portfolio_benchmark = px.line(title='Portfolio Performance vs Benchmark')
     
-    # Adds the cumulative returns for the portfolio
-    fig_portfolio_benchmark.add_trace(go.Scatter(x=portfolio_cumsum.index, 
-                              y = portfolio_cumsum,
-                              mode = 'lines', name = 'Portfolio'))
-    
-    # Adds the cumulative returns for the benchmark
-    fig_portfolio_benchmark.add_trace(go.Scatter(x=benchmark_cumsum.index, 
-                              y = benchmark_cumsum,
-                              mode = 'lines', name = 'Benchmark'))
+    # Adds the cumulative returns for the portfolio and for the benchmark
+    fig_portfolio_benchmark.add_traces(line_traces(pd.DataFrame({'Portfolio': portfolio_cumsum, 'Benchmark': benchmark_cumsum}),
+                                                   x_range))
     
     # Adjusts the layout to make the graph larger vertically and changes the title of the legend
-    fig_portfolio_benchmark.update_layout(height=420,template = 'plotly_white',hovermode='x unified')
+    fig_portfolio_benchmark.update_layout(height=420,template = 'plotly_white',hovermode='x unified',uirevision='zoom')
 
     # Adds the historical returns for each ticker on the plot    
     fig_portfolio_benchmark.update_yaxes(title_text='Cumulative Returns',
@@ -42,5 +36,7 @@ def portfolio_performance_vs_benchmark(portfolio_returns, benchmark_returns):
             ])
         )
     )
+    if x_range is not None:
+        fig_portfolio_benchmark.update_xaxes(range=x_range)
     
     return fig_portfolio_benchmark
\ No newline at end of file
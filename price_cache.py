@@ -0,0 +1,171 @@
+# Importing libraries
+
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import date
+
+import numpy as np
+import pandas as pd
+from config import PRICE_CACHE_PATH
+from market_data import get_provider
+
+# Serializes writes to the cache file when several requests fill gaps at once
+_write_lock = threading.Lock()
+
+# Days of the stored range downloaded again along with an adjacent gap, to check that both are on the same basis
+OVERLAP_DAYS = 7
+
+def _connect():
+
+    # Creates the cache file and its tables on first use
+    os.makedirs(os.path.dirname(PRICE_CACHE_PATH), exist_ok=True)
+    connection = sqlite3.connect(PRICE_CACHE_PATH, timeout=30)
+    connection.execute('CREATE TABLE IF NOT EXISTS prices '
+                       '(ticker TEXT, date TEXT, price REAL, PRIMARY KEY (ticker, date))')
+    # Stores the date range [start, end) already downloaded for each ticker
+    connection.execute('CREATE TABLE IF NOT EXISTS coverage '
+                       '(ticker TEXT PRIMARY KEY, start TEXT, end TEXT)')
+    return connection
+
+def _missing_ranges(covered, date_from, date_to):
+
+    # Nothing stored yet, the whole range has to be downloaded
+    if covered is None:
+        return [(date_from, date_to)]
+
+    # Only the parts before and after the stored range are missing (keeps the stored range contiguous)
+    start, end = covered
+    missing = []
+    if date_from < start:
+        missing.append((date_from, start))
+    if date_to > end:
+        missing.append((end, date_to))
+    return missing
+
+def _shift(day, days):
+    return (pd.Timestamp(day) + pd.Timedelta(days=days)).strftime('%Y-%m-%d')
+
+def _restated(connection, overlap):
+
+    # Adjusted prices are restated after every dividend (and all prices after a split), so a stored price that
+    # no longer matches the provider's means the stored history is on an older basis than the new download
+    if len(overlap) == 0:
+        return []
+    tickers = list(overlap.columns)
+    stored = pd.read_sql_query('SELECT ticker, date, price FROM prices WHERE ticker IN (%s) AND date >= ? AND date <= ?'
+                               % ','.join('?' * len(tickers)), connection,
+                               params=[*tickers, overlap.index.min().strftime('%Y-%m-%d'),
+                                       overlap.index.max().strftime('%Y-%m-%d')])
+    stored = stored.pivot(index='date', columns='ticker', values='price').reindex(columns=tickers)
+    stored.index = pd.to_datetime(stored.index)
+
+    restated = []
+    for ticker in tickers:
+        both = pd.concat([overlap[ticker], stored[ticker]], axis=1, join='inner').dropna()
+        if not np.allclose(both.iloc[:, 0], both.iloc[:, 1], rtol=1e-4):
+            restated.append(ticker)
+    return restated
+
+def _forget(connection, tickers):
+    with _write_lock, connection:
+        placeholders = ','.join('?' * len(tickers))
+        connection.execute('DELETE FROM prices WHERE ticker IN (%s)' % placeholders, tickers)
+        connection.execute('DELETE FROM coverage WHERE ticker IN (%s)' % placeholders, tickers)
+
+def _fill_gaps(connection, tickers, date_from, date_to):
+
+    # Finds the missing date ranges of each ticker
+    coverage = {ticker: (start, end) for ticker, start, end in connection.execute(
+        'SELECT ticker, start, end FROM coverage WHERE ticker IN (%s)' % ','.join('?' * len(tickers)), tickers)}
+    covered = dict(coverage)
+    gaps = {}
+    for ticker in tickers:
+        for gap in _missing_ranges(coverage.get(ticker), date_from, date_to):
+            gaps.setdefault(gap, []).append(ticker)
+
+    # Today's bar is still moving, so it is never marked as stored
+    today = date.today().strftime('%Y-%m-%d')
+
+    # Downloads each missing range once for all the tickers that share it
+    restated, invalidated = set(), set()
+    for (gap_from, gap_to), gap_tickers in gaps.items():
+
+        # Also downloads the stored days next to the gap, to find the histories restated since they were stored
+        download_from = _shift(gap_from, -OVERLAP_DAYS) if any(covered.get(ticker, (None, None))[1] == gap_from
+                                                                for ticker in gap_tickers) else gap_from
+        download_to = _shift(gap_to, OVERLAP_DAYS) if any(covered.get(ticker, (None, None))[0] == gap_to
+                                                          for ticker in gap_tickers) else gap_to
+        downloaded = get_provider().get_prices(gap_tickers, download_from, download_to)
+        in_gap = (downloaded.index >= gap_from) & (downloaded.index < gap_to)
+        restated.update(_restated(connection, downloaded[~in_gap]))
+        gap_tickers = [ticker for ticker in gap_tickers if ticker not in restated]
+        prices = downloaded.loc[in_gap, gap_tickers]
+
+        # A range with no trading days is legitimately empty; otherwise an empty ticker is not stored as covered
+        no_trading_days = not (pd.bdate_range(gap_from, gap_to) < gap_to).any()
+
+        with _write_lock, connection:
+            stacked = prices.stack().reset_index()
+            connection.executemany('INSERT OR REPLACE INTO prices VALUES (?, ?, ?)',
+                                   [(ticker, day.strftime('%Y-%m-%d'), float(price))
+                                    for day, ticker, price in stacked.itertuples(index=False)])
+
+            for ticker in gap_tickers:
+                if prices[ticker].count() == 0 and not no_trading_days:
+                    continue
+                if gap_from >= today:
+                    continue
+
+                # The stored range is read again here: it may have been invalidated during the download (e.g. by a
+                # new dividend), and extending it then would claim dates that have no prices any more
+                row = connection.execute('SELECT start, end FROM coverage WHERE ticker = ?', (ticker,)).fetchone()
+                if row is None and ticker in covered:
+                    invalidated.add(ticker)
+                    continue
+                start, end = row if row is not None else (gap_from, min(gap_to, today))
+                coverage[ticker] = (min(start, gap_from), max(end, min(gap_to, today)))
+                connection.execute('INSERT OR REPLACE INTO coverage VALUES (?, ?, ?)', (ticker, *coverage[ticker]))
+
+    # A history invalidated during the download is downloaded again over the requested range
+    invalidated -= restated
+    if invalidated:
+        _fill_gaps(connection, list(invalidated), date_from, date_to)
+
+    # A restated history is dropped and downloaded again over the whole range, so it is never stitched
+    # from two adjustment bases
+    if restated:
+        restated = list(restated)
+        full_from = min([date_from] + [covered.get(ticker, (date_from, date_to))[0] for ticker in restated])
+        full_to = max([date_to] + [covered.get(ticker, (date_from, date_to))[1] for ticker in restated])
+        _forget(connection, restated)
+        _fill_gaps(connection, restated, full_from, full_to)
+
+# Forgets the stored prices of tickers, e.g. when a new dividend or split restated their adjusted history
+def invalidate(tickers):
+    with closing(_connect()) as connection:
+        _forget(connection, list(tickers))
+
+# PRICE HISTORY WITH LOCAL CACHE
+def download_prices(tickers, date_from, date_to):
+
+    tickers = list(tickers)
+
+    with closing(_connect()) as connection:
+
+        # Downloads only the date ranges not already stored on disk
+        _fill_gaps(connection, tickers, date_from, date_to)
+
+        # Serves the whole requested range from disk (end date excluded)
+        stored = pd.read_sql_query('SELECT ticker, date, price FROM prices WHERE ticker IN (%s) '
+                                   'AND date >= ? AND date < ?' % ','.join('?' * len(tickers)),
+                                   connection, params=[*tickers, date_from, date_to])
+
+    # Pivots to a price panel with dates as rows and tickers as columns
+    df = stored.pivot(index='date', columns='ticker', values='price').reindex(columns=tickers)
+    df.index = pd.to_datetime(df.index)
+    df.index.name = 'Date'
+    df.columns.name = None
+
+    return df
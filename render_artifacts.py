@@ -0,0 +1,131 @@
+# Importing libraries
+
+import base64
+import hashlib
+import os
+import threading
+import weakref
+from io import BytesIO
+
+from flask import Response, abort, request
+
+from config import ARTIFACT_CACHE_BYTES, ARTIFACT_DIR, IMAGE_DELIVERY
+from result_cache import LRUCache
+
+# Path under which the server publishes rendered images
+ARTIFACT_URL = '/artifacts/'
+
+# A rendered image, identified by the hash of its bytes
+class Artifact:
+
+    def __init__(self, data, mimetype='image/png'):
+        self.key = hashlib.sha256(data).hexdigest()
+        self.data = data
+        self.mimetype = mimetype
+        self._data_uri = None
+
+    # Address of the image on the artifact endpoint
+    @property
+    def url(self):
+        return f'{ARTIFACT_URL}{self.key}.png'
+
+    # Encodes as base64 only the first time it is needed
+    @property
+    def data_uri(self):
+        if self._data_uri is None:
+            self._data_uri = f'data:{self.mimetype};base64,' + base64.b64encode(self.data).decode('ascii')
+        return self._data_uri
+
+# Content-addressed store: identical images across requests share the same bytes and encoding
+artifacts = LRUCache(max_entries=float('inf'), max_size=ARTIFACT_CACHE_BYTES, sizeof=lambda artifact: len(artifact.data))
+
+# Every artifact still held somewhere, e.g. by a cached report whose layout links to it, even once the store evicted it
+referenced = weakref.WeakValueDictionary()
+
+def _remember(artifact):
+    artifacts.put(artifact.key, artifact)
+    referenced[artifact.key] = artifact
+
+# Looks in the store, then among the evicted artifacts still referenced (putting them back in the store)
+def _from_memory(key):
+    artifact = artifacts.get(key)
+    if artifact is None:
+        artifact = referenced.get(key)
+        if artifact is not None:
+            artifacts.put(key, artifact)
+    return artifact
+
+def store_artifact(data, mimetype='image/png'):
+    artifact = Artifact(data, mimetype)
+    existing = _from_memory(artifact.key)
+    if existing is not None:
+        return existing
+    _remember(artifact)
+    if ARTIFACT_DIR:
+        _write_to_disk(artifact)
+    return artifact
+
+def get_artifact(key):
+    artifact = _from_memory(key)
+    if artifact is None and ARTIFACT_DIR:
+        artifact = _read_from_disk(key)
+    return artifact
+
+def _artifact_path(key):
+    return os.path.join(ARTIFACT_DIR, key + '.png')
+
+def _write_to_disk(artifact):
+
+    # Writes to a temporary name first, so other processes never read a half-written file
+    path = _artifact_path(artifact.key)
+    if not os.path.exists(path):
+        os.makedirs(ARTIFACT_DIR, exist_ok=True)
+        temporary = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temporary, 'wb') as file:
+            file.write(artifact.data)
+        os.replace(temporary, path)
+
+def _read_from_disk(key):
+
+    # Only hexadecimal hashes are looked up, never arbitrary paths
+    if not key or not all(character in '0123456789abcdef' for character in key):
+        return None
+    try:
+        with open(_artifact_path(key), 'rb') as file:
+            data = file.read()
+    except FileNotFoundError:
+        return None
+    artifact = Artifact(data)
+    _remember(artifact)
+    return artifact
+
+# Source of an image element: the artifact's URL or its inline base64 encoding (IMAGE_DELIVERY)
+def image_src(artifact):
+    return artifact.url if IMAGE_DELIVERY == 'url' else artifact.data_uri
+
+# SERVES ARTIFACTS OVER HTTP
+# The URL contains the hash of the bytes, so a response never changes and browsers can keep it forever
+def register_artifact_route(server):
+
+    @server.route(ARTIFACT_URL + '<key>.png')
+    def serve_artifact(key):
+        if request.if_none_match.contains(key):
+            response = Response(status=304)
+        else:
+            artifact = get_artifact(key)
+            if artifact is None:
+                abort(404)
+            response = Response(artifact.data, mimetype=artifact.mimetype)
+        response.set_etag(key)
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+        return response
+
+# Encodes a matplotlib figure as PNG bytes
+def figure_to_png(fig):
+
+    # Saves it to a temporary buffer, then empties the figure so its artists are freed right away
+    buf = BytesIO()
+    fig.savefig(buf, format="png")
+    fig.clear()
+
+    return buf.getvalue()
@@ -0,0 +1,116 @@
+# Importing libraries
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import JOB_RETENTION, PDF_PRECOMPUTE, REPORT_WORKERS
+from pdf_report import precompute_pdf
+from pipeline import ReportError, build_allocation_stage, build_performance_stage
+
+# Background threads building the reports, separate from the web server's threads
+_executor = ThreadPoolExecutor(max_workers=REPORT_WORKERS, thread_name_prefix='report')
+
+_lock = threading.Lock()
+
+# Jobs by result key, and the key of the latest job of each browser session
+_jobs = {}
+_sessions = {}
+
+class JobCancelled(Exception):
+    pass
+
+# A report being built in the background; the page polls it for each of its two stages
+class ReportJob:
+
+    def __init__(self, key, on_complete=None):
+        self.key = key
+        self.on_complete = on_complete
+        self.sessions = set()
+        self.cancelled = threading.Event()
+        self.report = None
+        self.context = None
+        self.error = None
+        self.finished_at = None
+        self.future = None
+
+    def _run(self, assets_and_investments, benchmark, date_from, date_to):
+        try:
+            if self.cancelled.is_set():
+                raise JobCancelled()
+            self.report = build_performance_stage(self.key, assets_and_investments, benchmark, date_from, date_to)
+
+            # A cancelled job stops between the stages (downloads already started are left to finish)
+            if self.cancelled.is_set():
+                raise JobCancelled()
+            self.context = build_allocation_stage(self.report)
+
+            # Hands the complete report over (e.g. to the result cache) before any page has to pick it up
+            if self.on_complete is not None:
+                self.on_complete(self)
+
+            # Optionally starts the PDF right away, so the export does not have to build it
+            if PDF_PRECOMPUTE:
+                precompute_pdf(self.context)
+        except JobCancelled:
+            self.error = 'Cancelled'
+        except ReportError as error:
+            self.error = str(error)
+        except Exception as error:
+            self.error = f'The report could not be built: {error}'
+        finally:
+            self.finished_at = time.monotonic()
+
+    # The performance stage is ready (or failed)
+    @property
+    def performance_ready(self):
+        return self.report is not None or self.finished_at is not None
+
+    @property
+    def finished(self):
+        return self.finished_at is not None
+
+# STARTS (OR JOINS) THE JOB BUILDING A REPORT
+# Identical requests in flight share one job; a new request from a session cancels its previous job,
+# unless another session is still waiting for it; on_complete(job) is called in the background once the report is complete
+def submit_report(session_id, key, assets_and_investments, benchmark, date_from, date_to, on_complete=None):
+
+    with _lock:
+        _forget_finished()
+
+        previous = _jobs.get(_sessions.get(session_id))
+        if previous is not None and previous.key != key:
+            previous.sessions.discard(session_id)
+            if not previous.sessions and not previous.finished:
+                previous.cancelled.set()
+                previous.future.cancel()
+                _drop(previous.key)
+
+        job = _jobs.get(key)
+        if job is None or job.error is not None:
+            job = ReportJob(key, on_complete)
+            job.future = _executor.submit(job._run, assets_and_investments, benchmark, date_from, date_to)
+            _jobs[key] = job
+        job.sessions.add(session_id)
+        _sessions[session_id] = key
+
+    return job
+
+def get_job(key):
+    with _lock:
+        return _jobs.get(key)
+
+# Drops jobs some time after they finished; their reports are in the result cache by then, for their pages
+# and for identical requests (a closed page never picks its job up)
+def _forget_finished():
+    now = time.monotonic()
+    for key, job in list(_jobs.items()):
+        if job.finished and now - job.finished_at > JOB_RETENTION:
+            _drop(key)
+
+def _drop(key):
+    job = _jobs.pop(key, None)
+    if job is not None:
+        for session_id in job.sessions:
+            if _sessions.get(session_id) == key:
+                del _sessions[session_id]
@@ -0,0 +1,72 @@
+# Importing libraries
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+
+from config import MARKET_DATA_PROVIDER, RESULT_CACHE_SIZE, RESULT_CACHE_TTL
+
+# Thread-safe least-recently-used cache bounded by number of entries (and optionally by total size),
+# with an optional expiry time per entry
+class LRUCache:
+
+    def __init__(self, max_entries, max_size=None, sizeof=len):
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.sizeof = sizeof
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            # Drops the entry if it has expired, otherwise marks it as the most recently used
+            value, expires, size = entry
+            if expires is not None and time.monotonic() >= expires:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value, ttl=None):
+        size = self.sizeof(value) if self.max_size is not None else 0
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, time.monotonic() + ttl if ttl is not None else None, size)
+            self._size += size
+
+            # Evicts the least recently used entries until the cache is within its bounds again
+            while self._entries and (len(self._entries) > self.max_entries or
+                                     (self.max_size is not None and self._size > self.max_size)):
+                self._remove(next(iter(self._entries)))
+
+    def discard(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def _remove(self, key):
+        value, expires, size = self._entries.pop(key)
+        self._size -= size
+
+# Finished reports (computed figures, encoded images and layout) of the latest requests
+results = LRUCache(RESULT_CACHE_SIZE)
+
+# Canonical hash of a request: the same holdings in any order, benchmark and dates give the same key
+def result_key(assets_and_investments, benchmark, date_from, date_to):
+    request = {'holdings': sorted((ticker, float(value)) for ticker, value in assets_and_investments.items()),
+               'benchmark': benchmark, 'date_from': date_from, 'date_to': date_to,
+               'provider': MARKET_DATA_PROVIDER}
+    return hashlib.sha256(json.dumps(request, sort_keys=True).encode('utf-8')).hexdigest()
+
+# Reports over past dates never change; ranges ending today or later expire after RESULT_CACHE_TTL
+def result_ttl(date_to):
+    return RESULT_CACHE_TTL if date_to >= date.today().strftime('%Y-%m-%d') else None
@@ -0,0 +1,75 @@
+# Importing libraries
+
+import queue
+import threading
+
+import plotly.graph_objs as go
+import plotly.io as pio
+from kaleido.scopes.plotly import PlotlyScope
+
+from config import STATIC_EXPORT_RENDERERS
+
+# Figure rendered to start a renderer and check that it answers
+_PROBE = go.Figure(go.Scatter(x=[0, 1], y=[0, 1]))
+
+# A renderer set up like plotly's own (same plotly.js and MathJax), so its images match write_image
+def _new_scope():
+    return PlotlyScope(plotlyjs=pio.kaleido.scope.plotlyjs, mathjax=pio.kaleido.scope.mathjax)
+
+# POOL OF KALEIDO RENDERERS
+# Each renderer is a long-lived kaleido (Chromium) process; a figure is exported by whichever renderer is free,
+# so an export never waits for one to start
+class RendererPool:
+
+    def __init__(self, size):
+        self.size = max(size, 1)
+        self._idle = queue.Queue()
+        self._started = False
+        self._lock = threading.Lock()
+
+    def _start(self):
+        with self._lock:
+            if not self._started:
+                for _ in range(self.size):
+                    self._idle.put(_new_scope())
+                self._started = True
+
+    # Health check: a renderer whose process has exited is replaced before it is used
+    def _checkout(self):
+        self._start()
+        scope = self._idle.get()
+        if scope._proc is not None and scope._proc.poll() is not None:
+            scope._shutdown_kaleido()
+            scope = _new_scope()
+        return scope
+
+    def render(self, fig, format='png', width=None, height=None, scale=None):
+        scope = self._checkout()
+        try:
+            return scope.transform(fig, format=format, width=width, height=height, scale=scale)
+        except Exception:
+            # The process may be in a bad state (e.g. crashed mid-export); it is started again on next use
+            scope._shutdown_kaleido()
+            raise
+        finally:
+            self._idle.put(scope)
+
+    # Starts every renderer and renders a small figure on each, so the first export is as fast as the others
+    def warm_up(self):
+        self._start()
+        scopes = [self._checkout() for _ in range(self.size)]
+        try:
+            for scope in scopes:
+                scope.transform(_PROBE, format='png')
+        finally:
+            for scope in scopes:
+                self._idle.put(scope)
+
+renderers = RendererPool(STATIC_EXPORT_RENDERERS)
+
+# EXPORTS A PLOTLY FIGURE AS AN IMAGE ('png' or 'svg' bytes)
+def figure_to_image(fig, format='png', width=None, height=None, scale=None):
+    return renderers.render(fig, format=format, width=width, height=height, scale=scale)
+
+def start_renderers():
+    renderers.warm_up()
@@ -0,0 +1,127 @@
+# Importing libraries
+
+import time
+from io import BytesIO
+
+from dash import dash_table
+from dash.dash_table import FormatTemplate
+from dash.dash_table.Format import Format, Group, Scheme, Symbol
+from matplotlib.figure import Figure
+
+from config import TABLE_BACKEND
+from overview_table import COLORED_COLUMNS, formatted_to_number, value_color
+from render_artifacts import store_artifact
+
+# DRAWS THE STYLED OVERVIEW TABLE WITH MATPLOTLIB
+def table_to_png_matplotlib(table):
+
+    # Formatted values, one row per asset plus the portfolio
+    data = table.data
+
+    fig = Figure(figsize=(10, 0.45 * (len(data) + 1)))
+    ax = fig.add_subplot()
+    ax.axis('off')
+
+    # Draws the cells without borders, centered like the styled table
+    cells = ax.table(cellText=data.to_numpy(), rowLabels=list(data.index), colLabels=list(data.columns),
+                     cellLoc='center', rowLoc='center', loc='center', edges='open')
+    cells.auto_set_font_size(False)
+    cells.set_fontsize(11)
+    cells.scale(1, 1.6)
+
+    # Bold header and tickers, green/red gains and losses
+    for (row, column), cell in cells.get_celld().items():
+        if row == 0 or column == -1:
+            cell.set_text_props(fontweight='bold')
+        elif data.columns[column] in COLORED_COLUMNS:
+            cell.set_text_props(color=value_color(data.iat[row - 1, column]))
+
+    buf = BytesIO()
+    fig.savefig(buf, format="png", dpi=150, bbox_inches='tight')
+    fig.clear()
+
+    return buf.getvalue()
+
+# SCREENSHOTS THE STYLED OVERVIEW TABLE IN A HEADLESS BROWSER
+def table_to_png_dataframe_image(table):
+
+    # Optional: needs dataframe_image and a Chrome installation
+    import dataframe_image as dfi
+
+    buf = BytesIO()
+    dfi.export(table, buf)
+
+    return buf.getvalue()
+
+# Image renderers by backend (the Dash table still needs an image for the PDF)
+TABLE_RENDERERS = {
+    'matplotlib': table_to_png_matplotlib,
+    'datatable': table_to_png_matplotlib,
+    'dataframe_image': table_to_png_dataframe_image,
+}
+
+# RENDERS A STYLED TABLE ONCE
+def render_table(table, backend=TABLE_BACKEND):
+    return store_artifact(TABLE_RENDERERS[backend](table))
+
+# Display format of each overview column, applied to the numeric values by the browser
+DATATABLE_FORMATS = {
+    'Current Value': FormatTemplate.money(2),
+    'Capital Gains': Format(precision=2, scheme=Scheme.fixed, group=Group.yes).symbol(Symbol.yes).symbol_suffix('%'),
+    'Net Profit/Loss': FormatTemplate.money(2),
+    'Dividend Payments': Format(precision=0, scheme=Scheme.fixed, group=Group.yes),
+    'Dividends': FormatTemplate.money(2),
+}
+
+# INTERACTIVE OVERVIEW TABLE FOR THE WEB VIEW
+def overview_datatable(table):
+
+    # Keeps the tickers as the first column and the values as numbers
+    data = table.data.rename_axis('Ticker').reset_index()
+    for column in DATATABLE_FORMATS:
+        data[column] = data[column].map(formatted_to_number)
+
+    columns = [{'name': '', 'id': 'Ticker'}] + [{'name': column, 'id': column, 'type': 'numeric', 'format': DATATABLE_FORMATS[column]}
+                                               for column in DATATABLE_FORMATS]
+
+    # Colors each gain or loss by its sign, whatever row it is in
+    conditional = [{'if': {'filter_query': '{%s} %s 0' % (column, operator), 'column_id': column}, 'color': color}
+                   for column in COLORED_COLUMNS for operator, color in [('>', 'limegreen'), ('<', 'red')]]
+
+    # Not sortable, so that the portfolio stays the last row under its assets
+    return dash_table.DataTable(id='table-1', data=data.to_dict('records'), columns=columns,
+                                style_cell={'textAlign': 'center', 'border': 'none', 'fontFamily': 'sans-serif'},
+                                style_header={'fontWeight': 'bold', 'backgroundColor': 'white'},
+                                style_data_conditional=conditional + [{'if': {'column_id': 'Ticker'}, 'fontWeight': 'bold'}])
+
+# TIMES EVERY AVAILABLE BACKEND ON THE SAME TABLE
+def benchmark_table_backends(table, repeat=5):
+
+    timings = {}
+    for backend in ['matplotlib', 'datatable', 'dataframe_image']:
+        try:
+            start = time.perf_counter()
+            for _ in range(repeat):
+                if backend == 'datatable':
+                    overview_datatable(table)
+                else:
+                    TABLE_RENDERERS[backend](table)
+            timings[backend] = (time.perf_counter() - start) / repeat
+        except Exception as error:
+            # e.g. no browser available for dataframe_image
+            timings[backend] = error
+
+    return timings
+
+if __name__ == '__main__':
+    from overview_table import overview_table
+    import pandas as pd
+
+    # Benchmarks the backends on a ten-asset overview table
+    tickers = [f'T{i}' for i in range(10)]
+    values = {ticker: 1000.0 * (i + 1) for i, ticker in enumerate(tickers)}
+    gains = {ticker: 10.0 * (i - 5) for i, ticker in enumerate(tickers)}
+    table = overview_table(None, None, values, pd.DataFrame({'Dividend Payments': 4}, index=tickers), None, None, None,
+                           values, gains, gains, sum(values.values()), 5.0, sum(gains.values()))
+    for backend, seconds in benchmark_table_backends(table).items():
+        print(f'{backend}: {seconds:.3f}s' if isinstance(seconds, float) else f'{backend}: unavailable ({seconds})')
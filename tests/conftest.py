@@ -0,0 +1,17 @@
+# Importing libraries
+
+import os
+import sys
+import tempfile
+
+# The tests run offline on synthetic data, with empty caches and every chart drawn in the test process;
+# the settings are read when config is first imported, so they are set before any module of the app is
+os.environ['MARKET_DATA_PROVIDER'] = 'local'
+os.environ['LOCAL_DATA_DIR'] = tempfile.mkdtemp()
+os.environ['CACHE_DIR'] = tempfile.mkdtemp()
+os.environ['RENDER_PROCESSES'] = '0'
+
+import matplotlib
+matplotlib.use('Agg')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,43 @@
+# Importing libraries
+
+import gc
+import tracemalloc
+
+import matplotlib.pyplot as plt
+
+from pipeline import build_allocation_stage, build_performance_stage
+from result_cache import result_key
+
+HOLDINGS = {'AAPL': 1000.0, 'MSFT': 2000.0, 'KO': 500.0, 'XOM': 700.0}
+REQUESTS = 5
+
+def build_report():
+    key = result_key(HOLDINGS, 'SPY', '2022-01-03', '2023-06-01')
+    return build_allocation_stage(build_performance_stage(key, HOLDINGS, 'SPY', '2022-01-03', '2023-06-01'))
+
+# Charts are drawn on standalone figures, never registered with pyplot, so none is left open after a report
+def test_no_figures_left_open():
+    build_report()
+    assert plt.get_fignums() == []
+
+# Memory held after N identical requests stays flat: each request frees its figures and
+# its images are shared with the previous request's
+def test_memory_stays_flat():
+
+    # Fills the caches (prices, artifacts, fonts) before measuring
+    build_report()
+    build_report()
+    gc.collect()
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for _ in range(REQUESTS):
+            build_report()
+        gc.collect()
+        growth = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    assert plt.get_fignums() == []
+    assert growth < 2 * 1024 * 1024, f'{growth / 1024:.0f} KB still held after {REQUESTS} requests'
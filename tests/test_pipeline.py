@@ -0,0 +1,36 @@
+# Importing libraries
+
+import pytest
+
+import dividend_store
+from market_data import get_provider
+from pipeline import build_performance_stage
+from result_cache import result_key
+
+# Provider failing its first dividend downloads, as a provider with a transient outage would
+class FlakyProvider:
+
+    def __init__(self, failures):
+        self.provider = get_provider()
+        self.failures = failures
+        self.calls = 0
+
+    def get_actions(self, ticker, start=None):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError('provider unavailable')
+        return self.provider.get_actions(ticker, start)
+
+# A failed download is not kept: the next identical request downloads again
+def test_failed_fetch_is_retried(monkeypatch):
+    provider = FlakyProvider(failures=2)
+    monkeypatch.setattr(dividend_store, 'get_provider', lambda: provider)
+    holdings = {'FLKY': 1000.0}
+    key = result_key(holdings, 'SPY', '2022-01-03', '2023-06-01')
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            build_performance_stage(key, holdings, 'SPY', '2022-01-03', '2023-06-01')
+
+    assert build_performance_stage(key, holdings, 'SPY', '2022-01-03', '2023-06-01').context['key'] == key
+    assert provider.calls == 3
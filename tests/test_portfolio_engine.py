@@ -0,0 +1,52 @@
+# Importing libraries
+
+import os
+
+import numpy as np
+import pandas as pd
+
+import batch
+from config import LOCAL_DATA_DIR
+from portfolio_engine import compute_portfolio, compute_portfolios
+
+# Figures of a small panel, worked out by hand from the first and last prices
+def test_compute_portfolios_small_panel():
+    prices = np.array([[10.0, 20.0, np.nan],
+                       [12.0, np.nan, np.nan],
+                       [15.0, 25.0, np.nan]])
+    investments = np.array([[100.0, 0.0, 0.0],
+                            [50.0, 40.0, 0.0],
+                            [0.0, 40.0, 30.0]])
+
+    matrix = compute_portfolios(prices, investments)
+
+    assert np.allclose(matrix.shares[:2], [[10, 0, 0], [5, 2, 0]])
+    assert np.allclose(matrix.current_values[:2], [[150, 0, 0], [75, 50, 0]])
+    assert np.allclose(matrix.current_total_values[:2], [150, 125])
+    assert np.allclose(matrix.net_gains[:2], [50, 35])
+    assert np.allclose(matrix.total_capital_gains[:2], [50, 35 / 90 * 100])
+
+    # Only the portfolio holding the ticker without prices is affected by it
+    assert np.isnan(matrix.current_total_values[2])
+
+def test_compute_portfolio_single():
+    df = pd.DataFrame({'A': [10.0, 12.0, 15.0], 'B': [20.0, 22.0, 25.0]})
+
+    portfolio = compute_portfolio(df, {'A': 50.0, 'B': 40.0})
+
+    assert np.allclose(portfolio.current_values, [75, 50])
+    assert np.allclose(portfolio.capital_gains, [50, 25])
+    assert np.allclose(portfolio.current_weights, [0.6, 0.4])
+    assert portfolio.current_total_value == 125 and portfolio.net_gains == 35
+
+# A portfolio holding a ticker without data for the period is reported as unavailable, the others are not affected
+def test_batch_with_unavailable_ticker():
+    os.makedirs(os.path.join(LOCAL_DATA_DIR, 'prices'), exist_ok=True)
+    pd.Series([100.0, 101.0], index=['2024-01-02', '2024-01-03'], name='Close').to_csv(
+        os.path.join(LOCAL_DATA_DIR, 'prices', 'LATE.csv'))
+
+    results = batch.evaluate_portfolios({'A': {'AAPL': 1000.0, 'MSFT': 2000.0}, 'B': {'LATE': 500.0}},
+                                        '2022-01-03', '2023-06-01')
+
+    assert results['B'] is None
+    assert results['A'].notna().all().all()
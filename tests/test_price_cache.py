@@ -0,0 +1,48 @@
+# Importing libraries
+
+import threading
+import time
+from contextlib import closing
+
+import price_cache
+from market_data import get_provider
+
+# Provider whose downloads take a while, so the cache can be changed during one
+class SlowProvider:
+
+    def __init__(self, delay):
+        self.provider = get_provider()
+        self.delay = delay
+
+    def get_prices(self, tickers, date_from, date_to):
+        time.sleep(self.delay)
+        return self.provider.get_prices(tickers, date_from, date_to)
+
+# A ticker invalidated while one of its gaps downloads is not left with coverage over dates without prices
+def test_invalidation_during_download(monkeypatch):
+    price_cache.download_prices(['RACE'], '2022-01-03', '2022-06-01')
+
+    monkeypatch.setattr(price_cache, 'get_provider', lambda: SlowProvider(0.5))
+    download = threading.Thread(target=price_cache.download_prices, args=(['RACE'], '2022-01-03', '2022-09-01'))
+    download.start()
+    time.sleep(0.2)
+    price_cache.invalidate(['RACE'])
+    download.join()
+
+    with closing(price_cache._connect()) as connection:
+        start, end = connection.execute("SELECT start, end FROM coverage WHERE ticker = 'RACE'").fetchone()
+        first = connection.execute("SELECT MIN(date) FROM prices WHERE ticker = 'RACE'").fetchone()[0]
+    assert first <= '2022-01-04' and start == '2022-01-03'
+    assert price_cache.download_prices(['RACE'], '2022-01-03', '2022-09-01').index[0].strftime('%Y-%m-%d') == '2022-01-03'
+
+# Prices stored without coverage (e.g. today's bar) that no longer match are downloaded again, like covered ones
+def test_restated_prices_without_coverage():
+    price_cache.download_prices(['COVERED'], '2022-01-03', '2022-06-01')
+    with closing(price_cache._connect()) as connection, connection:
+        connection.execute("INSERT INTO prices VALUES ('UNCOVERED', '2022-05-31', 1.0)")
+
+    prices = price_cache.download_prices(['COVERED', 'UNCOVERED'], '2022-06-01', '2022-09-01')
+
+    assert prices['UNCOVERED'].notna().all()
+    with closing(price_cache._connect()) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM prices WHERE ticker = 'UNCOVERED' AND price = 1.0").fetchone()[0] == 0
@@ -0,0 +1,21 @@
+# Importing libraries
+
+import gc
+
+import render_artifacts
+from result_cache import LRUCache
+
+# An image a cached report still links to is served even once the byte-bounded store evicted it
+def test_referenced_artifact_outlives_eviction(monkeypatch):
+    monkeypatch.setattr(render_artifacts, 'artifacts', LRUCache(max_entries=float('inf'), max_size=100,
+                                                                sizeof=lambda artifact: len(artifact.data)))
+
+    # Held like the artifacts of a cached report's context
+    kept = render_artifacts.store_artifact(b'k' * 60)
+    dropped_key = render_artifacts.store_artifact(b'd' * 60).key
+    render_artifacts.store_artifact(b'n' * 60)
+    gc.collect()
+
+    assert render_artifacts.artifacts.get(kept.key) is None
+    assert render_artifacts.get_artifact(kept.key) is kept
+    assert render_artifacts.get_artifact(dropped_key) is None
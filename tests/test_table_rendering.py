@@ -0,0 +1,31 @@
+# Importing libraries
+
+from pipeline import build_performance_stage
+from result_cache import result_key
+from table_rendering import overview_datatable
+
+HOLDINGS = {'AAPL': 1000.0, 'KO': 500.0}
+
+# The tickers are the first column of the interactive table, under the 'Ticker' id its bold style targets
+def test_overview_datatable_ticker_column():
+    key = result_key(HOLDINGS, 'SPY', '2022-01-03', '2023-06-01')
+    table = build_performance_stage(key, HOLDINGS, 'SPY', '2022-01-03', '2023-06-01').table
+
+    datatable = overview_datatable(table)
+
+    assert datatable.columns[0] == {'name': '', 'id': 'Ticker'}
+    assert [row['Ticker'] for row in datatable.data] == list(table.data.index)
+
+# The values stay numbers, formatted by the browser, and the colors follow the values rather than the row positions
+def test_overview_datatable_numeric_values():
+    key = result_key(HOLDINGS, 'SPY', '2022-01-03', '2023-06-01')
+    table = build_performance_stage(key, HOLDINGS, 'SPY', '2022-01-03', '2023-06-01').table
+
+    datatable = overview_datatable(table)
+
+    portfolio = datatable.data[-1]
+    assert portfolio['Ticker'] == 'Portfolio'
+    assert portfolio['Current Value'] == float(table.data.loc['Portfolio', 'Current Value'].replace('$', '').replace(',', ''))
+    assert all(column['type'] == 'numeric' for column in datatable.columns[1:])
+    assert all('filter_query' in style['if'] for style in datatable.style_data_conditional if 'color' in style)
+    assert not any('row_index' in style['if'] for style in datatable.style_data_conditional)
@@ -0,0 +1,79 @@
+# Importing libraries
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+import pandas as pd
+from config import METADATA_CACHE_PATH, METADATA_TTL
+from market_data import get_provider
+
+# Fields kept for each ticker, as named in the provider's info and in the returned dataframe
+FIELDS = {'country': 'Country', 'industry': 'Industry', 'sector': 'Sector'}
+
+# In-memory copy of the store: ticker -> (time fetched, {field: value})
+_memory = {}
+_lock = threading.Lock()
+
+def _connect():
+
+    # Creates the cache file and its table on first use
+    os.makedirs(os.path.dirname(METADATA_CACHE_PATH), exist_ok=True)
+    connection = sqlite3.connect(METADATA_CACHE_PATH, timeout=30)
+    connection.execute('CREATE TABLE IF NOT EXISTS metadata '
+                       '(ticker TEXT PRIMARY KEY, country TEXT, industry TEXT, sector TEXT, fetched_at REAL)')
+    return connection
+
+def _fetch(ticker):
+
+    # Obtains all info for the asset and keeps only the fields we use
+    info = get_provider().get_info(ticker)
+    return {field: info.get(field) for field in FIELDS}
+
+# TICKER METADATA WITH MEMORY AND DISK CACHE
+def get_ticker_metadata(tickers):
+
+    tickers = list(dict.fromkeys(tickers))
+    now = time.time()
+
+    with _lock:
+        entries = {ticker: _memory[ticker] for ticker in tickers if ticker in _memory}
+
+    # Looks on disk for the tickers not held in memory
+    missing = [ticker for ticker in tickers if ticker not in entries]
+    if missing:
+        with closing(_connect()) as connection:
+            rows = connection.execute('SELECT ticker, country, industry, sector, fetched_at FROM metadata '
+                                      'WHERE ticker IN (%s)' % ','.join('?' * len(missing)), missing).fetchall()
+        for ticker, country, industry, sector, fetched_at in rows:
+            entries[ticker] = (fetched_at, {'country': country, 'industry': industry, 'sector': sector})
+
+    # Fetches the tickers never seen or older than the TTL
+    fetched = {}
+    for ticker in tickers:
+        if ticker in entries and now - entries[ticker][0] < METADATA_TTL:
+            continue
+        try:
+            fetched[ticker] = (now, _fetch(ticker))
+        except Exception:
+            # Serves the expired copy if the provider is unavailable, otherwise there is nothing to show
+            if ticker not in entries:
+                raise
+    entries.update(fetched)
+
+    if fetched:
+        with closing(_connect()) as connection, connection:
+            connection.executemany('INSERT OR REPLACE INTO metadata VALUES (?, ?, ?, ?, ?)',
+                                   [(ticker, record['country'], record['industry'], record['sector'], fetched_at)
+                                    for ticker, (fetched_at, record) in fetched.items()])
+
+    with _lock:
+        _memory.update(entries)
+
+    # Returns one row per ticker with its country, industry and sector
+    metadata = pd.DataFrame([entries[ticker][1] for ticker in tickers], index=pd.Index(tickers, name='Ticker'))
+    metadata = metadata.rename(columns=FIELDS).fillna('Unknown')
+
+    return metadata